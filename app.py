@@ -1,11 +1,13 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
 import sys
 from pathlib import Path
+from types import MappingProxyType
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -13,6 +15,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config.settings import settings
 from utils.pyth_client import pyth_client
 from utils.exceptions import APIError
+from utils.file_cache import file_cache
+from utils.visualizations import APP_CSS
+from utils.data_processing import minmax_aggregate, minmax_lttb_indices
 
 # Validate configuration
 try:
@@ -30,32 +35,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-    <style>
-    .main {
-        background-color: #0E1117;
-        color: #FAFAFA;
-    }
-    .stButton>button {
-        background-color: #4F46E5;
-        color: white;
-        border: none;
-        border-radius: 4px;
-        padding: 0.5rem 1rem;
-    }
-    .stButton>button:hover {
-        background-color: #4338CA;
-        color: white;
-    }
-    .metric-card {
-        background-color: #1E293B;
-        padding: 1.5rem;
-        border-radius: 8px;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Custom CSS for better styling (re-emitted every rerun, or Streamlit drops the element)
+st.markdown(APP_CSS, unsafe_allow_html=True)
+
+# Chart time period -> days of history (read-only, shared across reruns)
+_DAYS_MAP = MappingProxyType({"24h": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365})
 
 # Initialize session state
 if 'selected_coin' not in st.session_state:
@@ -66,6 +50,12 @@ if 'selected_coin' not in st.session_state:
 def get_top_cryptos(limit=10):
     """Fetch top N cryptocurrencies from Pyth Network"""
     try:
+        # Serve from the on-disk cache first so restarts don't re-hit the API
+        params = {'limit': limit}
+        cached_result = file_cache.get('pyth', 'top_cryptos', params, ttl=settings.CACHE_TTL_PRICES)
+        if cached_result is not None:
+            return cached_result
+        
         # Get tracked coins from settings
         coin_ids = settings.TRACKED_COINS[:limit]
         prices_data = pyth_client.get_current_prices(coin_ids)
@@ -75,6 +65,8 @@ def get_top_cryptos(limit=10):
         for coin_id, data in prices_data.items():
             result.append(data)
         
+        if result:
+            file_cache.set('pyth', 'top_cryptos', result, params)
         return result
     except APIError as e:
         st.error(f"Pyth Network API Error: {str(e)}")
@@ -85,50 +77,59 @@ def get_top_cryptos(limit=10):
 
 @st.cache_data(ttl=settings.CACHE_TTL_HISTORICAL)
 def get_coin_data(coin_id, days=30):
-    """Fetch historical data for a specific coin from Pyth Network"""
+    """Fetch historical data for a specific coin from Pyth Network
+    
+    Returns a (timestamps_ns, prices) tuple of arrays; both are empty on failure.
+    Results are also kept on disk (per UTC day, for at most CACHE_TTL_HISTORICAL)
+    so a restart doesn't refetch them.
+    """
+    cache_prefix = f"{coin_id}_{days}_"
+    cache_name = f"{cache_prefix}{datetime.now(timezone.utc):%Y%m%d}"
+    cached = file_cache.get_arrays('hist', cache_name, ttl=settings.CACHE_TTL_HISTORICAL)
+    if cached is not None:
+        return cached['timestamps'], cached['prices']
+    
     try:
-        df = pyth_client.get_historical_data(coin_id, days=days)
-        
-        # Convert DataFrame to the format expected by process_historical_data
-        if not df.empty:
-            # Convert to millisecond timestamps and create prices array
-            prices = [[int(ts.timestamp() * 1000), price] 
-                     for ts, price in zip(df['timestamp'], df['price'])]
-            return {'prices': prices, 'market_caps': [], 'total_volumes': []}
-        else:
-            return {'prices': [], 'market_caps': [], 'total_volumes': []}
+        timestamps_ns, prices = pyth_client.get_historical_arrays(coin_id, days=days)
+        if len(prices):
+            file_cache.set_arrays('hist', cache_name, replaces=cache_prefix,
+                                  timestamps=timestamps_ns, prices=prices)
+        return timestamps_ns, prices
     except APIError as e:
         st.warning(f"Could not fetch historical data: {str(e)}")
-        return {'prices': [], 'market_caps': [], 'total_volumes': []}
     except Exception as e:
         st.warning(f"Error processing historical data: {str(e)}")
-        return {'prices': [], 'market_caps': [], 'total_volumes': []}
+    return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
 
 # Data processing functions
 def process_market_data(data):
-    """Process market data into a pandas DataFrame"""
+    """Process market data into a pandas DataFrame
+    
+    Market cap and volume stay numeric so they can be sorted and plotted;
+    format them at display time (e.g. ``st.column_config.NumberColumn(format="$%.0f")``).
+    """
     df = pd.DataFrame(data)
     if not df.empty:
         # Convert timestamp to datetime
         df['last_updated'] = pd.to_datetime(df['last_updated'])
-        # Format market cap and volume
-        df['market_cap'] = df['market_cap'].apply(lambda x: f"${x:,.0f}")
-        df['total_volume'] = df['total_volume'].apply(lambda x: f"${x:,.0f}")
     return df
 
-def process_historical_data(data, days=30):
-    """Process historical price data"""
-    prices = data.get('prices', [])
-    if not prices:
+def process_historical_data(timestamps_ns, prices):
+    """Process historical price arrays into a date-indexed DataFrame"""
+    if len(prices) == 0:
         return pd.DataFrame()
     
-    df = pd.DataFrame(prices, columns=['timestamp', 'price'])
-    df['date'] = pd.to_datetime(df['timestamp'], unit='ms')
-    df = df.set_index('date')
-    return df
+    # Explicit dtypes skip pandas' inference; the int64 -> datetime64 view is zero-copy
+    timestamps = np.asarray(timestamps_ns, dtype=np.int64).view('datetime64[ns]')
+    prices = np.asarray(prices, dtype=np.float64)
+    return pd.DataFrame({'price': prices}, index=pd.DatetimeIndex(timestamps, name='date'))
 
 # UI Components
-def render_sidebar():
+def _store_selected_coin():
+    """Copy the coin selectbox's value into session state that survives page switches"""
+    st.session_state.selected_coin = st.session_state._selected_coin_widget
+
+def render_sidebar(top_coins):
     """Render the sidebar with coin selection and filters"""
     st.sidebar.title("🔍 Navigation")
     
@@ -139,34 +140,26 @@ def render_sidebar():
         index=2
     )
     
-    # Get top cryptocurrencies from Pyth Network
-    top_coins = get_top_cryptos(limit=10)
-    
     if top_coins and len(top_coins) > 0:
         try:
             # Build coin selection lists
-            coin_names = [f"{coin['name']} ({coin['symbol']})" for coin in top_coins]
             coin_ids = [coin['id'] for coin in top_coins]
+            display_names = {coin['id']: f"{coin['name']} ({coin['symbol']})" for coin in top_coins}
             
-            # Find current selection index
-            current_index = 0
-            if 'selected_coin' in st.session_state and st.session_state.selected_coin in coin_ids:
-                current_index = coin_ids.index(st.session_state.selected_coin)
+            if st.session_state.get('selected_coin') not in display_names:
+                st.session_state.selected_coin = coin_ids[0]
             
-            # Coin selection dropdown
-            selected_coin_name = st.sidebar.selectbox(
+            # Coin selection dropdown. Streamlit drops widget state while other pages run, so the
+            # widget has its own key and copies into session_state.selected_coin, which persists
+            st.sidebar.selectbox(
                 "Select Cryptocurrency",
-                coin_names,
-                index=current_index,
-                key="coin_selector"
+                coin_ids,
+                index=coin_ids.index(st.session_state.selected_coin),
+                format_func=display_names.__getitem__,
+                key="_selected_coin_widget",
+                on_change=_store_selected_coin
             )
             
-            # Update session state
-            new_coin_id = coin_ids[coin_names.index(selected_coin_name)]
-            if st.session_state.selected_coin != new_coin_id:
-                st.session_state.selected_coin = new_coin_id
-                st.rerun()
-            
         except Exception as e:
             st.sidebar.error(f"Error processing coin data: {str(e)}")
             # Fallback to default
@@ -209,8 +202,31 @@ def render_price_chart(historical_data):
     
     fig = go.Figure()
     
-    # Add price line
-    fig.add_trace(go.Scatter(
+    # Downsample to roughly the chart's pixel width so rendering cost doesn't grow with the window
+    if len(historical_data) > settings.CHART_MAX_POINTS:
+        timestamps = historical_data.index.asi8
+        prices = historical_data['price'].to_numpy()
+        
+        # Min/max envelope keeps the extremes the downsampled line skips over
+        band_x, band_min, band_max, _ = minmax_aggregate(
+            timestamps, prices, settings.CHART_MAX_POINTS // 4
+        )
+        band_x = pd.DatetimeIndex(band_x)
+        fig.add_trace(go.Scattergl(
+            x=band_x, y=band_max, mode='lines', line=dict(width=0),
+            showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scattergl(
+            x=band_x, y=band_min, mode='lines', line=dict(width=0),
+            fill='tonexty', fillcolor='rgba(79, 70, 229, 0.2)',
+            name='Range', hoverinfo='skip'
+        ))
+        
+        idx = minmax_lttb_indices(timestamps, prices, settings.CHART_MAX_POINTS)
+        historical_data = historical_data.iloc[idx]
+    
+    # Add price line (WebGL renderer scales better than SVG for long series)
+    fig.add_trace(go.Scattergl(
         x=historical_data.index,
         y=historical_data['price'],
         mode='lines',
@@ -259,16 +275,16 @@ def render_ai_insights(coin_data):
 
 # Main app
 def main():
+    # Get top coins data once per rerun and share it with the sidebar
+    top_coins = get_top_cryptos(limit=10)
+    
     # Sidebar
-    time_period = render_sidebar()
+    time_period = render_sidebar(top_coins)
     
     # Main content
     st.title("📊 CryptoInsight Pro")
     st.markdown("Real-time cryptocurrency market intelligence powered by **Pyth Network** 🔮")
     
-    # Get top coins data
-    top_coins = get_top_cryptos(limit=10)
-    
     if not top_coins or len(top_coins) == 0:
         st.error("Unable to load cryptocurrency data. Please try again later.")
         st.info("This may be due to API rate limits or network issues.")
@@ -276,8 +292,8 @@ def main():
     
     try:
         # Get and display coin data
-        coin_data = next((coin for coin in top_coins 
-                         if coin['id'] == st.session_state.selected_coin), None)
+        coins_by_id = {coin['id']: coin for coin in top_coins}
+        coin_data = coins_by_id.get(st.session_state.selected_coin)
         
         if coin_data:
             # Metrics row
@@ -286,12 +302,10 @@ def main():
             # Chart section
             st.markdown("---")
             
-            # Map time period to days
-            days_map = {"24h": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365}
-            days = days_map.get(time_period, 30)
+            days = _DAYS_MAP.get(time_period, 30)
             
-            historical_data = get_coin_data(st.session_state.selected_coin, days=days)
-            df_historical = process_historical_data(historical_data, days=days)
+            timestamps_ns, prices = get_coin_data(st.session_state.selected_coin, days=days)
+            df_historical = process_historical_data(timestamps_ns, prices)
             
             if not df_historical.empty:
                 render_price_chart(df_historical)
@@ -4,104 +4,98 @@ Centralizes all application settings and environment variables.
 """
 
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+_BASE_DIR = Path(__file__).parent.parent
 
-class Settings:
-    """Application configuration settings."""
-    
-    # Base paths
-    BASE_DIR = Path(__file__).parent.parent
-    MODEL_DIR = BASE_DIR / "models"
-    
-    # Check if running on Streamlit Cloud
-    IS_STREAMLIT_CLOUD = os.getenv('IS_STREAMLIT_CLOUD', '').lower() == 'true'
-    
-    # Get configuration from Streamlit secrets in cloud environment
+
+def _streamlit_secrets() -> Optional[Any]:
+    """Return Streamlit secrets, or None when Streamlit isn't installed."""
     try:
         import streamlit as st
-        if IS_STREAMLIT_CLOUD:
-            # Venice AI Configuration from Streamlit secrets
-            VENICE_API_KEY: str = st.secrets.get("venice", {}).get("api_key", "")
-        else:
-            VENICE_API_KEY: str = os.getenv("VENICE_API_KEY", "")
     except ImportError:
-        VENICE_API_KEY: str = os.getenv("VENICE_API_KEY", "")
+        return None
+    return st.secrets
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application configuration settings."""
+
+    # Base paths
+    BASE_DIR: Path = _BASE_DIR
+    MODEL_DIR: Path = _BASE_DIR / "models"
+    CACHE_DIR: Path = _BASE_DIR / ".cache"
+
+    # Running on Streamlit Cloud (secrets come from st.secrets instead of env)
+    IS_STREAMLIT_CLOUD: bool = False
+
+    # Venice AI Configuration
+    VENICE_API_KEY: str = ""
     VENICE_API_URL: str = "https://api.venice.ai/v1"
-    
+
     # Redis Configuration
-    try:
-        import streamlit as st
-        if IS_STREAMLIT_CLOUD:
-            REDIS_HOST: str = st.secrets.get("redis", {}).get("host", "")
-            REDIS_PORT: int = int(st.secrets.get("redis", {}).get("port", "6379"))
-            REDIS_DB: int = int(st.secrets.get("redis", {}).get("db", "0"))
-            REDIS_PASSWORD: Optional[str] = st.secrets.get("redis", {}).get("password", None)
-        else:
-            REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-            REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-            REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
-            REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
-    except ImportError:
-        REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-        REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-        REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
-        REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
-    
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_PASSWORD: Optional[str] = None
+
     # Application Configuration
-    APP_ENV: str = os.getenv("APP_ENV", "development")
-    DEBUG_MODE: bool = os.getenv("DEBUG_MODE", "false").lower() == "true"
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    
+    APP_ENV: str = "development"
+    DEBUG_MODE: bool = False
+    LOG_LEVEL: str = "INFO"
+
     # Cache TTL Settings (in seconds)
-    CACHE_TTL_PRICES: int = int(os.getenv("CACHE_TTL_PRICES", "120"))  # 2 minutes
-    CACHE_TTL_HISTORICAL: int = int(os.getenv("CACHE_TTL_HISTORICAL", "3600"))  # 1 hour
-    CACHE_TTL_AI_INSIGHTS: int = int(os.getenv("CACHE_TTL_AI_INSIGHTS", "900"))  # 15 minutes
-    CACHE_TTL_NEWS: int = int(os.getenv("CACHE_TTL_NEWS", "1800"))  # 30 minutes
-    CACHE_TTL_MODELS: int = int(os.getenv("CACHE_TTL_MODELS", "86400"))  # 24 hours
-    
+    CACHE_TTL_PRICES: int = 120  # 2 minutes
+    CACHE_TTL_HISTORICAL: int = 3600  # 1 hour
+    CACHE_TTL_AI_INSIGHTS: int = 900  # 15 minutes
+    CACHE_TTL_NEWS: int = 1800  # 30 minutes
+    CACHE_TTL_MODELS: int = 86400  # 24 hours
+
     # API Rate Limits (requests per minute)
-    COINGECKO_RATE_LIMIT: int = int(os.getenv("COINGECKO_RATE_LIMIT", "50"))
-    VENICE_AI_RATE_LIMIT: int = int(os.getenv("VENICE_AI_RATE_LIMIT", "100"))
-    
+    COINGECKO_RATE_LIMIT: int = 50
+    VENICE_AI_RATE_LIMIT: int = 100
+
     # CoinGecko API Configuration
     COINGECKO_API_URL: str = "https://api.coingecko.com/api/v3"
     COINGECKO_TIMEOUT: int = 10  # seconds
     COINGECKO_RETRY_ATTEMPTS: int = 3
     COINGECKO_RETRY_DELAY: int = 2  # seconds
-    
+
     # CryptoPanic API Configuration
     CRYPTOPANIC_API_URL: str = "https://cryptopanic.com/api/v1"
-    CRYPTOPANIC_API_KEY: str = os.getenv("CRYPTOPANIC_API_KEY", "")
-    
+    CRYPTOPANIC_API_KEY: str = ""
+
     # Pyth Network API Configuration
     PYTH_API_URL: str = "https://api.pyth.network"
     PYTH_API_TIMEOUT: int = 10  # seconds
     PYTH_API_RETRY_ATTEMPTS: int = 3
     PYTH_API_RETRY_DELAY: int = 2  # seconds
-    
+
     # Model Configuration
-    LSTM_EPOCHS: int = int(os.getenv("LSTM_EPOCHS", "50"))
-    LSTM_BATCH_SIZE: int = int(os.getenv("LSTM_BATCH_SIZE", "32"))
+    LSTM_EPOCHS: int = 50
+    LSTM_BATCH_SIZE: int = 32
     LSTM_SEQUENCE_LENGTH: int = 60  # days of historical data for training
     LSTM_PREDICTION_DAYS: int = 7  # days to predict into future
-    MODEL_SAVE_PATH: Path = Path(os.getenv("MODEL_SAVE_PATH", "./models"))
-    
+    MODEL_SAVE_PATH: Path = Path("./models")
+
     # Tracked cryptocurrencies (Pyth Network compatible IDs)
-    TRACKED_COINS = [
+    TRACKED_COINS: Tuple[str, ...] = (
         'bitcoin', 'ethereum', 'solana', 'cardano', 'polkadot',
         'avalanche-2', 'polygon', 'chainlink', 'uniswap', 'cosmos'
-    ]
-    
+    )
+
     # API Provider (pyth or coingecko)
-    API_PROVIDER = os.getenv('API_PROVIDER', 'pyth')
-    
-    COIN_DISPLAY_NAMES = {
+    API_PROVIDER: str = "pyth"
+
+    COIN_DISPLAY_NAMES: Dict[str, str] = field(default_factory=lambda: {
         "bitcoin": "Bitcoin (BTC)",
         "ethereum": "Ethereum (ETH)",
         "solana": "Solana (SOL)",
@@ -112,36 +106,85 @@ class Settings:
         "chainlink": "Chainlink (LINK)",
         "uniswap": "Uniswap (UNI)",
         "cosmos": "Cosmos (ATOM)"
-    }
-    
+    })
+
     # UI Configuration
     PAGE_TITLE: str = "CryptoInsight Pro"
     PAGE_ICON: str = "📊"
     LAYOUT: str = "wide"
-    
+    CHART_MAX_POINTS: int = 2000  # ~2x a typical chart width in pixels
+
     # Performance Targets
     TARGET_LOAD_TIME: float = 3.0  # seconds
     MAX_MEMORY_MB: int = 512
-    
+
     @classmethod
-    def validate(cls) -> bool:
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables (and Streamlit secrets on Streamlit Cloud)."""
+        is_streamlit_cloud = os.getenv('IS_STREAMLIT_CLOUD', '').lower() == 'true'
+        secrets = _streamlit_secrets() if is_streamlit_cloud else None
+
+        if secrets is not None:
+            # Venice AI and Redis configuration from Streamlit secrets
+            redis_secrets = secrets.get("redis", {})
+            secret_values = dict(
+                VENICE_API_KEY=secrets.get("venice", {}).get("api_key", ""),
+                REDIS_HOST=redis_secrets.get("host", ""),
+                REDIS_PORT=int(redis_secrets.get("port", "6379")),
+                REDIS_DB=int(redis_secrets.get("db", "0")),
+                REDIS_PASSWORD=redis_secrets.get("password", None),
+            )
+        else:
+            secret_values = dict(
+                VENICE_API_KEY=os.getenv("VENICE_API_KEY", ""),
+                REDIS_HOST=os.getenv("REDIS_HOST", "localhost"),
+                REDIS_PORT=int(os.getenv("REDIS_PORT", "6379")),
+                REDIS_DB=int(os.getenv("REDIS_DB", "0")),
+                REDIS_PASSWORD=os.getenv("REDIS_PASSWORD"),
+            )
+
+        return cls(
+            IS_STREAMLIT_CLOUD=is_streamlit_cloud,
+            APP_ENV=os.getenv("APP_ENV", "development"),
+            DEBUG_MODE=os.getenv("DEBUG_MODE", "false").lower() == "true",
+            LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+            CACHE_TTL_PRICES=int(os.getenv("CACHE_TTL_PRICES", "120")),
+            CACHE_TTL_HISTORICAL=int(os.getenv("CACHE_TTL_HISTORICAL", "3600")),
+            CACHE_TTL_AI_INSIGHTS=int(os.getenv("CACHE_TTL_AI_INSIGHTS", "900")),
+            CACHE_TTL_NEWS=int(os.getenv("CACHE_TTL_NEWS", "1800")),
+            CACHE_TTL_MODELS=int(os.getenv("CACHE_TTL_MODELS", "86400")),
+            COINGECKO_RATE_LIMIT=int(os.getenv("COINGECKO_RATE_LIMIT", "50")),
+            VENICE_AI_RATE_LIMIT=int(os.getenv("VENICE_AI_RATE_LIMIT", "100")),
+            CRYPTOPANIC_API_KEY=os.getenv("CRYPTOPANIC_API_KEY", ""),
+            LSTM_EPOCHS=int(os.getenv("LSTM_EPOCHS", "50")),
+            LSTM_BATCH_SIZE=int(os.getenv("LSTM_BATCH_SIZE", "32")),
+            MODEL_SAVE_PATH=Path(os.getenv("MODEL_SAVE_PATH", "./models")),
+            API_PROVIDER=os.getenv('API_PROVIDER', 'pyth'),
+            **secret_values
+        )
+
+    def validate(self) -> bool:
         """Validate required configuration settings."""
-        if not cls.MODEL_DIR.exists():
-            cls.MODEL_DIR.mkdir(parents=True, exist_ok=True)
+        if not self.MODEL_DIR.exists():
+            self.MODEL_DIR.mkdir(parents=True, exist_ok=True)
         return True
-    
-    @classmethod
-    def is_production(cls) -> bool:
+
+    def is_production(self) -> bool:
         """Check if running in production environment."""
-        return cls.APP_ENV == "production"
-    
-    @classmethod
-    def get_redis_url(cls) -> str:
+        return self.APP_ENV == "production"
+
+    def get_redis_url(self) -> str:
         """Get Redis connection URL."""
-        if cls.REDIS_PASSWORD:
-            return f"redis://:{cls.REDIS_PASSWORD}@{cls.REDIS_HOST}:{cls.REDIS_PORT}/{cls.REDIS_DB}"
-        return f"redis://{cls.REDIS_HOST}:{cls.REDIS_PORT}/{cls.REDIS_DB}"
+        if self.REDIS_PASSWORD:
+            return f"redis://:{self.REDIS_PASSWORD}@{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings snapshot (read from the environment once)."""
+    return Settings.from_env()
 
 
 # Create settings instance
-settings = Settings()
+settings = get_settings()
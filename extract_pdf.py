@@ -1,23 +1,56 @@
 #!/usr/bin/env python3
 """Extract text from PDF file."""
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 try:
-    import PyPDF2
-    pdf_path = sys.argv[1] if len(sys.argv) > 1 else "View_Job_Posting_Details-2.pdf"
-    with open(pdf_path, 'rb') as pdf_file:
-        reader = PyPDF2.PdfReader(pdf_file)
-        text = ''.join([page.extract_text() for page in reader.pages])
-        print(text)
+    import PyPDF2 as pdf_lib
 except ImportError:
     try:
-        import pypdf
-        pdf_path = sys.argv[1] if len(sys.argv) > 1 else "View_Job_Posting_Details-2.pdf"
-        with open(pdf_path, 'rb') as pdf_file:
-            reader = pypdf.PdfReader(pdf_file)
-            text = ''.join([page.extract_text() for page in reader.pages])
-            print(text)
+        import pypdf as pdf_lib
     except ImportError:
         print("Please install PyPDF2 or pypdf: pip install PyPDF2")
         sys.exit(1)
+
+# Page parsing is CPU-bound pure Python, so large files are split across processes
+PARALLEL_PAGE_THRESHOLD = 100
+
+
+def _extract_page_range(args):
+    """Extract text from a contiguous page range (PdfReader isn't picklable, so reopen)."""
+    pdf_path, start, stop = args
+    reader = pdf_lib.PdfReader(pdf_path)
+    return ''.join(map(lambda page: page.extract_text() or '', reader.pages[start:stop]))
+
+
+def iter_text(pdf_path):
+    """Yield the text of the PDF one chunk at a time (a page, or a page range for large files)."""
+    reader = pdf_lib.PdfReader(pdf_path)
+    num_pages = len(reader.pages)
+
+    if num_pages <= PARALLEL_PAGE_THRESHOLD:
+        for page in reader.pages:
+            yield page.extract_text() or ''
+        return
+
+    workers = os.cpu_count() or 1
+    step = -(-num_pages // workers)
+    ranges = [(pdf_path, start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_extract_page_range, ranges)
+
+
+def extract_text(pdf_path):
+    """Extract the text of every page in the PDF."""
+    return ''.join(iter_text(pdf_path))
+
+
+if __name__ == "__main__":
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else "View_Job_Posting_Details-2.pdf"
+    # Write as pages come in so only one chunk of text is held at a time
+    write = sys.stdout.write
+    for chunk in iter_text(pdf_path):
+        write(chunk)
+    write('\n')
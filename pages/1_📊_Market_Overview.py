@@ -16,9 +16,14 @@ from config.settings import settings
 from utils.pyth_client import pyth_client
 from utils.cache_manager import cache_manager
 from utils.data_processing import normalize_prices
-from utils.visualizations import create_price_chart, create_comparison_chart
+from utils.visualizations import create_price_chart, create_comparison_chart, MARKET_OVERVIEW_CSS
 from utils.exceptions import CoinGeckoAPIError
 
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:
+    st_autorefresh = None
+
 # Page configuration
 st.set_page_config(
     page_title="Market Overview - CryptoInsight Pro",
@@ -26,19 +31,8 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom CSS
-st.markdown("""
-    <style>
-    .metric-card {
-        background-color: #1E293B;
-        padding: 1.5rem;
-        border-radius: 8px;
-        border: 1px solid #374151;
-    }
-    .positive { color: #10B981; }
-    .negative { color: #EF4444; }
-    </style>
-""", unsafe_allow_html=True)
+# Custom CSS (re-emitted every rerun, or Streamlit drops the element)
+st.markdown(MARKET_OVERVIEW_CSS, unsafe_allow_html=True)
 
 
 @st.cache_data(ttl=settings.CACHE_TTL_PRICES)
@@ -52,27 +46,49 @@ def fetch_market_data(force_refresh=False):
         return None
 
 
-def render_metric_card(coin_data, col):
-    """Render a metric card for a cryptocurrency."""
-    with col:
-        # Price change color
-        change_24h = coin_data.get('price_change_percentage_24h', 0)
-        color_class = 'positive' if change_24h >= 0 else 'negative'
-        arrow = '▲' if change_24h >= 0 else '▼'
-        
-        st.markdown(f"""
+@st.cache_data(ttl=settings.CACHE_TTL_PRICES)
+def fetch_historical_data(coin_ids, days):
+    """Fetch historical price data for the given coins (tuple of IDs, so the call is hashable)."""
+    return pyth_client.get_historical_data_many(list(coin_ids), days=days)
+
+
+@st.cache_data
+def to_csv_bytes(df):
+    """Serialize a DataFrame to CSV once per distinct frame."""
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def metric_card_html(name, symbol, current_price, change_24h, market_cap, total_volume):
+    """Build the HTML for a metric card."""
+    color_class = 'positive' if change_24h >= 0 else 'negative'
+    arrow = '▲' if change_24h >= 0 else '▼'
+    
+    return f"""
             <div class="metric-card">
-                <h3>{coin_data['name']} ({coin_data['symbol']})</h3>
-                <h2>${coin_data['current_price']:,.2f}</h2>
+                <h3>{name} ({symbol})</h3>
+                <h2>${current_price:,.2f}</h2>
                 <p class="{color_class}">
                     {arrow} {abs(change_24h):.2f}% (24h)
                 </p>
                 <p style="font-size: 0.9em; color: #9CA3AF;">
-                    Market Cap: ${coin_data['market_cap']:,.0f}<br>
-                    Volume: ${coin_data['total_volume']:,.0f}
+                    Market Cap: ${market_cap:,.0f}<br>
+                    Volume: ${total_volume:,.0f}
                 </p>
             </div>
-        """, unsafe_allow_html=True)
+        """
+
+
+def render_metric_card(coin_data, col):
+    """Render a metric card for a cryptocurrency."""
+    with col:
+        st.markdown(metric_card_html(
+            coin_data['name'],
+            coin_data['symbol'],
+            coin_data['current_price'],
+            coin_data.get('price_change_percentage_24h', 0),
+            coin_data['market_cap'],
+            coin_data['total_volume']
+        ), unsafe_allow_html=True)
         
         # Sparkline
         if coin_data.get('sparkline_7d'):
@@ -91,7 +107,8 @@ def main():
         st.markdown(f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     with col2:
         if st.button("🔄 Refresh Data"):
-            st.cache_data.clear()
+            # Only the price snapshot; cached histories and exports stay valid
+            fetch_market_data.clear()
             st.rerun()
     with col3:
         cache_stats = cache_manager.get_stats()
@@ -110,17 +127,19 @@ def main():
     # Display metric cards in grid
     st.subheader("Top Cryptocurrencies")
     
+    coins = list(market_data.values())
+    
     # Create 5 columns for top 5 coins
     cols = st.columns(5)
-    for idx, (coin_id, coin_data) in enumerate(list(market_data.items())[:5]):
-        render_metric_card(coin_data, cols[idx])
+    for col, coin_data in zip(cols, coins[:5]):
+        render_metric_card(coin_data, col)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Second row for next 5 coins
     cols = st.columns(5)
-    for idx, (coin_id, coin_data) in enumerate(list(market_data.items())[5:10]):
-        render_metric_card(coin_data, cols[idx])
+    for col, coin_data in zip(cols, coins[5:10]):
+        render_metric_card(coin_data, col)
     
     st.markdown("---")
     
@@ -161,12 +180,10 @@ def main():
             try:
                 with st.spinner("Loading price data..."):
                     # Fetch historical data for selected coins
-                    comparison_data = {}
-                    for coin_id in selected_coin_ids:
-                        df = pyth_client.get_historical_data(coin_id, days=days)
-                        if normalize:
-                            df = normalize_prices(df)
-                        comparison_data[coin_id] = df
+                    comparison_data = fetch_historical_data(tuple(selected_coin_ids), days)
+                    if normalize:
+                        comparison_data = {coin_id: normalize_prices(df)
+                                           for coin_id, df in comparison_data.items()}
                     
                     # Create comparison chart
                     if normalize:
@@ -194,14 +211,15 @@ def main():
                             'Volume': f"${coin_data['total_volume']:,.0f}"
                         })
                     
+                    comparison_df = pd.DataFrame(comparison_table)
                     st.dataframe(
-                        pd.DataFrame(comparison_table),
+                        comparison_df,
                         use_container_width=True,
                         hide_index=True
                     )
                     
                     # Export button
-                    csv = pd.DataFrame(comparison_table).to_csv(index=False)
+                    csv = to_csv_bytes(comparison_df)
                     st.download_button(
                         label="📥 Export to CSV",
                         data=csv,
@@ -214,11 +232,12 @@ def main():
         else:
             st.info("Please select at least 2 coins to compare")
     
-    # Auto-refresh every 60 seconds
+    # Auto-refresh every 60 seconds (scheduled in the browser, so no server thread is held)
     if st.session_state.get('auto_refresh', False):
-        import time
-        time.sleep(60)
-        st.rerun()
+        if st_autorefresh is not None:
+            st_autorefresh(interval=60_000, key="market_overview_refresh")
+        else:
+            st.caption("Install streamlit-autorefresh to enable auto-refresh.")
 
 
 if __name__ == "__main__":
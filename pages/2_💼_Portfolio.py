@@ -40,30 +40,32 @@ def fetch_current_prices():
 
 def calculate_portfolio_value(holdings, prices):
     """Calculate total portfolio value and breakdown."""
-    portfolio_data = []
-    total_value = 0
-    
-    for coin_id, amount in holdings.items():
-        if coin_id in prices and amount > 0:
-            coin_data = prices[coin_id]
-            value = amount * coin_data['current_price']
-            total_value += value
-            
-            portfolio_data.append({
-                'coin_id': coin_id,
-                'name': coin_data['name'],
-                'symbol': coin_data['symbol'],
-                'amount': amount,
-                'price': coin_data['current_price'],
-                'value': value,
-                'change_24h': coin_data.get('price_change_percentage_24h', 0)
-            })
-    
-    # Calculate allocation percentages
-    for item in portfolio_data:
-        item['allocation'] = (item['value'] / total_value * 100) if total_value > 0 else 0
-    
-    return portfolio_data, total_value
+    coin_ids = [coin_id for coin_id, amount in holdings.items() if coin_id in prices and amount > 0]
+    if not coin_ids:
+        return [], 0
+    
+    df = pd.DataFrame.from_dict(
+        {coin_id: prices[coin_id] for coin_id in coin_ids}, orient='index'
+    )
+    
+    # Vectorized value and allocation columns instead of per-holding loops
+    portfolio = pd.DataFrame({
+        'coin_id': coin_ids,
+        'name': df['name'].to_numpy(),
+        'symbol': df['symbol'].to_numpy(),
+        'amount': pd.Series(holdings)[coin_ids].to_numpy(dtype=float),
+        'price': df['current_price'].to_numpy(dtype=float),
+    })
+    portfolio['value'] = portfolio['amount'] * portfolio['price']
+    portfolio['change_24h'] = (
+        df['price_change_percentage_24h'].fillna(0).to_numpy(dtype=float)
+        if 'price_change_percentage_24h' in df else 0.0
+    )
+    
+    total_value = portfolio['value'].sum()
+    portfolio['allocation'] = portfolio['value'] / total_value * 100 if total_value > 0 else 0.0
+    
+    return portfolio.to_dict('records'), float(total_value)
 
 
 def main():
@@ -126,6 +128,8 @@ def main():
         st.warning("No valid holdings found in your portfolio")
         return
     
+    df = pd.DataFrame(portfolio_data)
+    
     # Display total value
     st.markdown("---")
     col1, col2, col3 = st.columns(3)
@@ -139,10 +143,7 @@ def main():
     
     with col2:
         # Calculate weighted 24h change
-        weighted_change = sum(
-            item['change_24h'] * item['allocation'] / 100 
-            for item in portfolio_data
-        )
+        weighted_change = float(df['change_24h'].to_numpy() @ df['allocation'].to_numpy()) / 100
         st.metric(
             label="24h Portfolio Change",
             value=f"{weighted_change:.2f}%",
@@ -171,19 +172,24 @@ def main():
     with col2:
         st.subheader("Holdings Breakdown")
         
-        # Create detailed table
-        df = pd.DataFrame(portfolio_data)
+        # Create detailed table (numeric columns, formatted at render time)
         df_display = pd.DataFrame({
             'Asset': df['name'],
-            'Amount': df['amount'].apply(lambda x: f"{x:.4f}"),
-            'Price': df['price'].apply(lambda x: f"${x:,.2f}"),
-            'Value': df['value'].apply(lambda x: f"${x:,.2f}"),
-            'Allocation': df['allocation'].apply(lambda x: f"{x:.2f}%"),
-            '24h Change': df['change_24h'].apply(lambda x: f"{x:+.2f}%")
+            'Amount': df['amount'],
+            'Price': df['price'],
+            'Value': df['value'],
+            'Allocation': df['allocation'],
+            '24h Change': df['change_24h']
         })
         
         st.dataframe(
-            df_display,
+            df_display.style.format({
+                'Amount': '{:.4f}',
+                'Price': '${:,.2f}',
+                'Value': '${:,.2f}',
+                'Allocation': '{:.2f}%',
+                '24h Change': '{:+.2f}%'
+            }),
             use_container_width=True,
             hide_index=True
         )
@@ -195,8 +201,11 @@ def main():
     
     col1, col2, col3, col4 = st.columns(4)
     
+    top_performer = df.loc[df['change_24h'].idxmax()]
+    worst_performer = df.loc[df['change_24h'].idxmin()]
+    largest_holding = df.loc[df['allocation'].idxmax()]
+    
     with col1:
-        top_performer = max(portfolio_data, key=lambda x: x['change_24h'])
         st.metric(
             "Top Performer (24h)",
             top_performer['name'],
@@ -204,7 +213,6 @@ def main():
         )
     
     with col2:
-        worst_performer = min(portfolio_data, key=lambda x: x['change_24h'])
         st.metric(
             "Worst Performer (24h)",
             worst_performer['name'],
@@ -212,7 +220,6 @@ def main():
         )
     
     with col3:
-        largest_holding = max(portfolio_data, key=lambda x: x['allocation'])
         st.metric(
             "Largest Holding",
             largest_holding['name'],
@@ -220,7 +227,7 @@ def main():
         )
     
     with col4:
-        avg_change = sum(item['change_24h'] for item in portfolio_data) / len(portfolio_data)
+        avg_change = df['change_24h'].mean()
         st.metric(
             "Average 24h Change",
             f"{avg_change:.2f}%"
@@ -5,6 +5,7 @@ Displays 7-day cryptocurrency price predictions with confidence intervals.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import sys
@@ -16,7 +17,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.settings import settings
 from utils.ml_models import get_lstm_predictor
 from utils.database import db_manager
+from utils.data_processing import minmax_lttb_indices
 from utils.exceptions import ModelError
+from utils.visualizations import PREDICTIONS_CSS
 
 # Page configuration
 st.set_page_config(
@@ -25,30 +28,14 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom CSS
-st.markdown("""
-    <style>
-    .prediction-card {
-        background-color: #1E293B;
-        padding: 1.5rem;
-        border-radius: 8px;
-        border: 1px solid #374151;
-        margin: 1rem 0;
-    }
-    .metric-highlight {
-        background-color: #0F172A;
-        padding: 1rem;
-        border-radius: 6px;
-        border-left: 4px solid #3B82F6;
-    }
-    .forecast-positive { color: #10B981; font-weight: bold; }
-    .forecast-negative { color: #EF4444; font-weight: bold; }
-    .confidence-band {
-        fill: rgba(59, 130, 246, 0.1);
-        stroke: rgba(59, 130, 246, 0.3);
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Custom CSS (re-emitted every rerun, or Streamlit drops the element)
+st.markdown(PREDICTIONS_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource(show_spinner=False)
+def load_predictor(coin_id):
+    """Get the LSTM predictor for a coin, shared across reruns and sessions."""
+    return get_lstm_predictor(coin_id)
 
 
 def create_prediction_chart(historical_data, predictions_data, coin_name):
@@ -59,18 +46,26 @@ def create_prediction_chart(historical_data, predictions_data, coin_name):
     hist_df['timestamp'] = pd.to_datetime(hist_df['timestamp'], utc=True, errors='coerce')
     hist_df = hist_df.dropna(subset=['timestamp']).sort_values('timestamp')
 
+    # Downsample long histories so the browser isn't sent every row
+    if len(hist_df) > settings.CHART_MAX_POINTS:
+        idx = minmax_lttb_indices(
+            pd.DatetimeIndex(hist_df['timestamp']).asi8,
+            hist_df['price'].to_numpy(),
+            settings.CHART_MAX_POINTS
+        )
+        hist_df = hist_df.iloc[idx]
+
     # Predictions data
-    pred_dates = [pd.to_datetime(date, utc=True, errors='coerce') for date in predictions_data['dates']]
-    pred_dates = [d for d in pred_dates if pd.notna(d)]  # Filter out NaT values
-    pred_prices = predictions_data['predictions'][:len(pred_dates)]  # Trim to match dates
-    pred_lower = predictions_data['confidence_intervals']['lower'][:len(pred_dates)]
-    pred_upper = predictions_data['confidence_intervals']['upper'][:len(pred_dates)]
+    pred_dates = pd.to_datetime(predictions_data['dates'], utc=True, errors='coerce').dropna()  # Filter out NaT values
+    pred_prices = np.asarray(predictions_data['predictions'][:len(pred_dates)])  # Trim to match dates
+    pred_lower = np.asarray(predictions_data['confidence_intervals']['lower'][:len(pred_dates)])
+    pred_upper = np.asarray(predictions_data['confidence_intervals']['upper'][:len(pred_dates)])
 
     # Create figure
     fig = go.Figure()
 
-    # Historical prices
-    fig.add_trace(go.Scatter(
+    # Historical prices (WebGL renderer; the CI polygon below stays SVG for fill='toself')
+    fig.add_trace(go.Scattergl(
         x=hist_df['timestamp'],
         y=hist_df['price'],
         mode='lines',
@@ -80,7 +75,7 @@ def create_prediction_chart(historical_data, predictions_data, coin_name):
     ))
 
     # Prediction line
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=pred_dates,
         y=pred_prices,
         mode='lines+markers',
@@ -92,8 +87,8 @@ def create_prediction_chart(historical_data, predictions_data, coin_name):
 
     # Confidence interval
     fig.add_trace(go.Scatter(
-        x=pred_dates + pred_dates[::-1],
-        y=pred_upper + pred_lower[::-1],
+        x=pred_dates.append(pred_dates[::-1]),
+        y=np.concatenate([pred_upper, pred_lower[::-1]]),
         fill='toself',
         fillcolor='rgba(16, 185, 129, 0.2)',
         line=dict(color='rgba(16, 185, 129, 0.3)'),
@@ -225,7 +220,7 @@ def main():
         with st.spinner("🔄 Training/loading LSTM model and generating predictions..."):
             try:
                 # Get predictor (trains if needed)
-                predictor = get_lstm_predictor(selected_coin)
+                predictor = load_predictor(selected_coin)
 
                 # Generate predictions
                 predictions = predictor.predict_future(days_ahead=7)
@@ -253,24 +248,16 @@ def main():
                 # Prediction summary
                 st.subheader("🎯 7-Day Forecast Summary")
 
+                pred_dates = pd.to_datetime(pd.Series(predictions['dates']), utc=True, errors='coerce')
                 pred_df = pd.DataFrame({
-                    'Date': [pd.to_datetime(date, utc=True, errors='coerce').strftime('%Y-%m-%d') 
-                            if pd.notna(pd.to_datetime(date, utc=True, errors='coerce')) else 'Invalid Date'
-                            for date in predictions['dates']],
-                    'Predicted Price': predictions['predictions'],
-                    'Lower Bound': predictions['confidence_intervals']['lower'],
-                    'Upper Bound': predictions['confidence_intervals']['upper']
+                    'Date': pred_dates.dt.strftime('%Y-%m-%d').fillna('Invalid Date'),
+                    'Predicted Price': np.asarray(predictions['predictions'], dtype=float),
+                    'Lower Bound': np.asarray(predictions['confidence_intervals']['lower'], dtype=float),
+                    'Upper Bound': np.asarray(predictions['confidence_intervals']['upper'], dtype=float)
                 })
 
-                # Style the dataframe
-                def style_price(val):
-                    return f"${val:,.2f}"
-
-                styled_df = pred_df.style.format({
-                    'Predicted Price': style_price,
-                    'Lower Bound': style_price,
-                    'Upper Bound': style_price
-                })
+                # Style the dataframe (format strings, not a Python callable per cell)
+                styled_df = pred_df.style.format('${:,.2f}', subset=['Predicted Price', 'Lower Bound', 'Upper Bound'])
 
                 st.dataframe(styled_df, use_container_width=True)
 
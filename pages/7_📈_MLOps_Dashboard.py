@@ -5,10 +5,14 @@ Displays model registry, performance metrics, and monitoring dashboards.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import sqlite3
 import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 # Add project root to path
@@ -16,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.model_registry import ModelRegistry
 from utils.model_monitor import ModelMonitor
+from utils.data_processing import lttb_indices
 
 # Page configuration
 st.set_page_config(
@@ -46,10 +51,132 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Scope widget reruns to the section that changed (st.fragment on Streamlit >= 1.37,
+# st.experimental_fragment on 1.33-1.36, a plain full-page rerun on older versions)
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
 # Initialize components
 registry = ModelRegistry()
 monitor = ModelMonitor()
 
+# Max points per performance trend trace
+PERF_CHART_MAX_POINTS = 500
+
+@st.cache_data(ttl=60)
+def load_model_versions():
+    """Get all registered model versions as a DataFrame (shared by every dashboard section)"""
+    return registry.get_model_versions_df()
+
+@st.cache_data(ttl=60)
+def load_latest_version(coin_id):
+    """Get the latest registered model version for a coin"""
+    return registry.get_latest_version(coin_id)
+
+@st.cache_resource
+def _predictions_db():
+    """Open one shared query-only connection to the monitoring database, with the lock guarding it"""
+    # Opened like ModelMonitor does (which has already created the file and tables), so it
+    # never fails on a missing database; query_only keeps this connection from writing
+    conn = sqlite3.connect(monitor.db_path, check_same_thread=False)
+    conn.execute("PRAGMA query_only = 1")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -32000")
+    return conn, threading.Lock()
+
+@contextmanager
+def predictions_connection():
+    """Use the shared monitoring connection (one script thread at a time; sqlite3 connections aren't thread-safe)"""
+    conn, lock = _predictions_db()
+    with lock:
+        yield conn
+
+@st.cache_data
+def to_csv_bytes(df):
+    """Serialize a DataFrame to CSV once per distinct frame"""
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data
+def performance_figure(coin_id, version, df):
+    """Build the performance trend figure once per distinct history (as a plain dict)"""
+    # Downsample each trend separately so both keep their own peaks
+    dates_ns = pd.DatetimeIndex(df['date']).asi8
+    mape_df = df.iloc[lttb_indices(dates_ns, df['mape'].to_numpy(), PERF_CHART_MAX_POINTS)]
+    rmse_df = df.iloc[lttb_indices(dates_ns, df['rmse'].to_numpy(), PERF_CHART_MAX_POINTS)]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=mape_df['date'],
+        y=mape_df['mape'],
+        mode='lines+markers',
+        name='MAPE (%)',
+        line=dict(color='#3B82F6')
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=rmse_df['date'],
+        y=rmse_df['rmse'],
+        mode='lines+markers',
+        name='RMSE',
+        line=dict(color='#10B981'),
+        yaxis='y2'
+    ))
+
+    fig.update_layout(
+        title=f"Model Performance Trends - {coin_id}",
+        xaxis_title="Date",
+        yaxis_title="MAPE (%)",
+        yaxis2=dict(
+            title="RMSE",
+            overlaying="y",
+            side="right"
+        ),
+        hovermode="x unified"
+    )
+
+    return fig.to_dict()
+
+@st.cache_data
+def accuracy_figure(coin_id, version, actual, predicted):
+    """Build the predicted vs actual figure once per distinct prediction set (as a plain dict)"""
+    # Perfect prediction line
+    max_val = float(np.maximum(predicted, actual).max())
+    min_val = float(np.minimum(predicted, actual).min())
+    perfect_line = [min_val, max_val]
+
+    fig = go.Figure()
+
+    # Scatter plot (WebGL; the 2-point reference line below stays SVG)
+    fig.add_trace(go.Scattergl(
+        x=actual,
+        y=predicted,
+        mode='markers',
+        name='Predictions',
+        marker=dict(color='#3B82F6', size=8)
+    ))
+
+    # Perfect prediction line
+    fig.add_trace(go.Scatter(
+        x=perfect_line,
+        y=perfect_line,
+        mode='lines',
+        name='Perfect Prediction',
+        line=dict(color='#EF4444', dash='dash')
+    ))
+
+    fig.update_layout(
+        title=f"Predicted vs Actual Prices - {coin_id}",
+        xaxis_title="Actual Price ($)",
+        yaxis_title="Predicted Price ($)",
+        showlegend=True
+    )
+
+    return fig.to_dict()
+
+def comparison_options(versions, mapes):
+    """Map selectbox labels to model versions"""
+    return {f"{version} (MAPE: {mape:.2f}%)": version for version, mape in zip(versions, mapes)}
+
 def get_health_color(score):
     """Get color class based on health score"""
     if score >= 80:
@@ -59,31 +186,24 @@ def get_health_color(score):
     else:
         return "health-critical"
 
-def render_model_registry_table():
+def render_model_registry_table(models):
     """Render the model registry table"""
     st.subheader("📋 Model Registry")
 
-    models = registry.get_model_versions()
-
-    if not models:
+    if models.empty:
         st.info("No models registered yet. Train some models first!")
         return
 
-    # Convert to DataFrame for display
-    df = pd.DataFrame(models)
-    df['created_at'] = pd.to_datetime(df['created_at']).dt.strftime('%Y-%m-%d %H:%M')
-
-    # Format metrics
-    df['rmse'] = df['rmse'].round(4)
-    df['mae'] = df['mae'].round(4)
-    df['mape'] = df['mape'].round(2)
-
-    # Reorder columns
-    columns = ['version', 'coin_id', 'created_at', 'rmse', 'mae', 'mape', 'model_path']
-    df_display = df[columns]
-
-    # Rename columns for display
-    df_display.columns = ['Version', 'Coin', 'Created', 'RMSE', 'MAE', 'MAPE (%)', 'Model Path']
+    # Build the display frame straight from the registry columns
+    df_display = pd.DataFrame({
+        'Version': models['version'],
+        'Coin': models['coin_id'],
+        'Created': models['created_at'].dt.strftime('%Y-%m-%d %H:%M'),
+        'RMSE': models['rmse'].round(4),
+        'MAE': models['mae'].round(4),
+        'MAPE (%)': models['mape'].round(2),
+        'Model Path': models['model_path']
+    })
 
     st.dataframe(
         df_display,
@@ -92,7 +212,7 @@ def render_model_registry_table():
     )
 
     # Export button
-    csv = df_display.to_csv(index=False)
+    csv = to_csv_bytes(df_display)
     st.download_button(
         label="📥 Export Registry to CSV",
         data=csv,
@@ -100,21 +220,20 @@ def render_model_registry_table():
         mime="text/csv"
     )
 
-def render_performance_over_time():
+@fragment
+def render_performance_over_time(coins):
     """Render performance trends over time"""
     st.subheader("📈 Performance Over Time")
 
     # Coin selector
-    models = registry.get_model_versions()
-    if not models:
+    if not coins:
         st.info("No performance data available")
         return
 
-    coins = list(set([m['coin_id'] for m in models]))
     selected_coin = st.selectbox("Select Coin", coins, key="perf_coin")
 
     # Get performance history
-    latest_version = registry.get_latest_version(selected_coin)
+    latest_version = load_latest_version(selected_coin)
     if not latest_version:
         st.warning(f"No models found for {selected_coin}")
         return
@@ -129,76 +248,44 @@ def render_performance_over_time():
     df = pd.DataFrame(perf_history)
     df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
 
-    # Create line chart
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['mape'],
-        mode='lines+markers',
-        name='MAPE (%)',
-        line=dict(color='#3B82F6')
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['rmse'],
-        mode='lines+markers',
-        name='RMSE',
-        line=dict(color='#10B981'),
-        yaxis='y2'
-    ))
-
-    fig.update_layout(
-        title=f"Model Performance Trends - {selected_coin}",
-        xaxis_title="Date",
-        yaxis_title="MAPE (%)",
-        yaxis2=dict(
-            title="RMSE",
-            overlaying="y",
-            side="right"
-        ),
-        hovermode="x unified"
+    st.plotly_chart(
+        performance_figure(selected_coin, latest_version['version'], df),
+        use_container_width=True
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
-def render_model_comparison():
+@fragment
+def render_model_comparison(models, coins):
     """Render model comparison side-by-side"""
     st.subheader("🔄 Model Comparison")
 
-    models = registry.get_model_versions()
     if len(models) < 2:
         st.info("Need at least 2 models for comparison")
         return
 
-    # Get unique coins
-    coins = list(set([m['coin_id'] for m in models]))
     selected_coin = st.selectbox("Select Coin for Comparison", coins, key="comp_coin")
 
     # Get models for this coin
-    coin_models = [m for m in models if m['coin_id'] == selected_coin]
+    coin_models = models[models['coin_id'] == selected_coin].set_index('version', drop=False)
     if len(coin_models) < 2:
         st.warning(f"Need at least 2 models for {selected_coin} to compare")
         return
 
     # Select two models to compare
-    model_options = {f"{m['version']} (MAPE: {m['mape']:.2f}%)": m['version']
-                    for m in coin_models}
+    model_options = comparison_options(coin_models['version'], coin_models['mape'])
 
     col1, col2 = st.columns(2)
 
     with col1:
         model1_version = st.selectbox("Model 1", list(model_options.keys()),
                                     index=0, key="model1")
-        model1 = next(m for m in coin_models if m['version'] == model_options[model1_version])
+        model1 = coin_models.loc[model_options[model1_version]]
 
     with col2:
         remaining_models = [k for k in model_options.keys() if k != model1_version]
         model2_version = st.selectbox("Model 2", remaining_models,
                                     index=0 if remaining_models else None, key="model2")
         if model2_version:
-            model2 = next(m for m in coin_models if m['version'] == model_options[model2_version])
+            model2 = coin_models.loc[model_options[model2_version]]
         else:
             st.warning("No second model available")
             return
@@ -210,120 +297,103 @@ def render_model_comparison():
             f"{model1['rmse']:.4f}",
             f"{model1['mae']:.4f}",
             f"{model1['mape']:.2f}",
-            pd.to_datetime(model1['created_at']).strftime('%Y-%m-%d %H:%M')
+            model1['created_at'].strftime('%Y-%m-%d %H:%M')
         ],
         'Model 2': [
             f"{model2['rmse']:.4f}",
             f"{model2['mae']:.4f}",
             f"{model2['mape']:.2f}",
-            pd.to_datetime(model2['created_at']).strftime('%Y-%m-%d %H:%M')
+            model2['created_at'].strftime('%Y-%m-%d %H:%M')
         ]
     }
 
     df_comp = pd.DataFrame(comparison_data)
     st.table(df_comp)
 
-def render_prediction_accuracy():
+@fragment
+def render_prediction_accuracy(coins):
     """Render prediction vs actual scatter plot"""
     st.subheader("🎯 Prediction Accuracy")
 
-    models = registry.get_model_versions()
-    if not models:
+    if not coins:
         st.info("No prediction data available")
         return
 
-    coins = list(set([m['coin_id'] for m in models]))
     selected_coin = st.selectbox("Select Coin", coins, key="pred_coin")
 
     # Get latest model for this coin
-    latest_model = registry.get_latest_version(selected_coin)
+    latest_model = load_latest_version(selected_coin)
     if not latest_model:
         st.warning(f"No models found for {selected_coin}")
         return
 
     # Get predictions from database
-    import sqlite3
-    with sqlite3.connect("models/models.db") as conn:
-        predictions = conn.execute('''
+    params = (latest_model['version'], selected_coin)
+    with predictions_connection() as conn:
+        predictions = pd.read_sql_query('''
             SELECT predicted_price, actual_price
             FROM predictions
             WHERE model_version = ? AND coin_id = ? AND actual_price IS NOT NULL
             ORDER BY prediction_timestamp DESC
             LIMIT 100
-        ''', (latest_model['version'], selected_coin)).fetchall()
-
-    if not predictions:
+        ''', conn, params=params)
+
+        # MAPE over the same rows, aggregated by SQLite rather than in Python
+        avg_mape = conn.execute('''
+            SELECT AVG(ABS(predicted_price - actual_price) * 100.0 / actual_price)
+            FROM (
+                SELECT predicted_price, actual_price
+                FROM predictions
+                WHERE model_version = ? AND coin_id = ? AND actual_price IS NOT NULL
+                ORDER BY prediction_timestamp DESC
+                LIMIT 100
+            )
+        ''', params).fetchone()[0]
+
+    if predictions.empty:
         st.info("No prediction data available yet")
         return
 
     # Create scatter plot
-    predicted = [p['predicted_price'] for p in predictions]
-    actual = [p['actual_price'] for p in predictions]
+    predicted = predictions['predicted_price'].to_numpy(dtype=np.float64)
+    actual = predictions['actual_price'].to_numpy(dtype=np.float64)
 
-    # Perfect prediction line
-    max_val = max(max(predicted), max(actual))
-    min_val = min(min(predicted), min(actual))
-    perfect_line = [min_val, max_val]
-
-    fig = go.Figure()
-
-    # Scatter plot
-    fig.add_trace(go.Scatter(
-        x=actual,
-        y=predicted,
-        mode='markers',
-        name='Predictions',
-        marker=dict(color='#3B82F6', size=8)
-    ))
-
-    # Perfect prediction line
-    fig.add_trace(go.Scatter(
-        x=perfect_line,
-        y=perfect_line,
-        mode='lines',
-        name='Perfect Prediction',
-        line=dict(color='#EF4444', dash='dash')
-    ))
-
-    fig.update_layout(
-        title=f"Predicted vs Actual Prices - {selected_coin}",
-        xaxis_title="Actual Price ($)",
-        yaxis_title="Predicted Price ($)",
-        showlegend=True
+    st.plotly_chart(
+        accuracy_figure(selected_coin, latest_model['version'], actual, predicted),
+        use_container_width=True
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
     # Accuracy metrics
-    errors = [abs(p - a) / a * 100 for p, a in zip(predicted, actual)]
-    avg_mape = sum(errors) / len(errors)
-
     st.metric("Average MAPE", f"{avg_mape:.2f}%")
 
-def render_model_health_score():
+@fragment
+def render_model_health_score(models):
     """Render overall model health indicators"""
     st.subheader("❤️ Model Health Dashboard")
 
-    models = registry.get_model_versions()
-    if not models:
+    if models.empty:
         st.info("No models to monitor")
         return
 
+    models = models.to_dict('records')
+
     # Update actual prices first
     monitor.update_actual_prices()
 
     health_scores = []
     retraining_alerts = []
 
+    # One aggregate query for every model instead of several per model
+    health_metrics = monitor.get_all_health_metrics(models)
+
     for model in models:
-        score = monitor.get_model_health_score(model['version'], model['coin_id'])
-        degradation = monitor.detect_performance_degradation(model['version'], model['coin_id'])
-        retrain_check = monitor.should_retrain_model(model['version'], model['coin_id'])
+        health = health_metrics[(model['version'], model['coin_id'])]
+        retrain_check = health['retrain']
 
         health_scores.append({
             'model': model,
-            'score': score,
-            'degradation': degradation
+            'score': health['score'],
+            'degradation': health['degradation']
         })
 
         if retrain_check.get('should_retrain', False):
@@ -344,16 +414,24 @@ def render_model_health_score():
             # Rollback options
             candidates = registry.get_rollback_candidates(model['coin_id'], model['version'])
             if candidates:
-                st.markdown("**Rollback Options:**")
-                for candidate in candidates[:3]:  # Show top 3 candidates
-                    if st.button(f"Rollback to {candidate['version']} (MAPE: {candidate['mape']:.2f}%)",
-                               key=f"rollback_{model['version']}_{candidate['version']}"):
-                        result = registry.rollback_to_version(candidate['version'])
-                        if result['success']:
-                            st.success(result['message'])
-                            st.rerun()
-                        else:
-                            st.error(result['error'])
+                # One form per alert: picking a target doesn't rerun the page, only submitting does
+                candidate_labels = {c['version']: f"{c['version']} (MAPE: {c['mape']:.2f}%)"
+                                    for c in candidates[:3]}  # Show top 3 candidates
+                with st.form(key=f"rollback_{model['version']}"):
+                    target_version = st.selectbox(
+                        "Rollback Options",
+                        list(candidate_labels),
+                        format_func=candidate_labels.__getitem__
+                    )
+                    submitted = st.form_submit_button("Rollback")
+
+                if submitted:
+                    result = registry.rollback_to_version(target_version)
+                    if result['success']:
+                        st.success(result['message'])
+                        st.rerun()
+                    else:
+                        st.error(result['error'])
             else:
                 st.warning("No rollback candidates available")
         st.markdown("---")
@@ -394,26 +472,32 @@ def main():
         st.markdown(f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     with col2:
         if st.button("🔄 Refresh Data"):
+            load_model_versions.clear()
+            load_latest_version.clear()
             st.rerun()
 
     st.markdown("---")
 
+    # Load the registry once for every section; unique() keeps coin order stable across reruns
+    models = load_model_versions()
+    coins = models['coin_id'].unique().tolist()
+
     # Render all dashboard sections
-    render_model_health_score()
+    render_model_health_score(models)
     st.markdown("---")
 
     col1, col2 = st.columns(2)
 
     with col1:
-        render_model_registry_table()
+        render_model_registry_table(models)
 
     with col2:
-        render_model_comparison()
+        render_model_comparison(models, coins)
 
     st.markdown("---")
-    render_performance_over_time()
+    render_performance_over_time(coins)
     st.markdown("---")
-    render_prediction_accuracy()
+    render_prediction_accuracy(coins)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Test that cached values round-trip through the Redis serializer unchanged."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+import pandas as pd
+
+import utils.cache_manager as cache_module
+from utils.cache_manager import _deserialize, _serialize
+
+_MSGPACK_TAG = b'\xc1m'
+_PICKLE_TAG = b'\xc1p'
+
+
+def _round_trip(value):
+    data = _serialize(value)
+    return data[:2], _deserialize(data)
+
+
+def _assert_frame_round_trips(df: pd.DataFrame, tag: bytes):
+    """Check the frame comes back identical, through both the Arrow and the plain msgpack encodings."""
+    arrow = cache_module.pa
+    try:
+        for pa in {arrow, None}:
+            cache_module.pa = pa
+            data_tag, result = _round_trip(df)
+            assert data_tag == tag, (data_tag, pa)
+            pd.testing.assert_frame_equal(result, df, check_index_type=True, check_column_type=True)
+            assert type(result.index) is type(df.index)
+    finally:
+        cache_module.pa = arrow
+
+
+def test_plain_frames_use_msgpack():
+    """Numeric/datetime columns with a RangeIndex or naive DatetimeIndex stay on msgpack."""
+    _assert_frame_round_trips(pd.DataFrame({'price': [1.5, 2.5], 'volume': [1, 2]}), _MSGPACK_TAG)
+    _assert_frame_round_trips(
+        pd.DataFrame(
+            {'price': [1.5, 2.5], 'ok': [True, False]},
+            index=pd.DatetimeIndex(['2024-01-01', '2024-01-03'], name='date')
+        ),
+        _MSGPACK_TAG
+    )
+
+
+def test_duplicate_columns_are_pickled():
+    df = pd.DataFrame([[1, 2]], columns=['a', 'a'])
+    _assert_frame_round_trips(df, _PICKLE_TAG)
+
+
+def test_non_str_and_multiindex_columns_are_pickled():
+    _assert_frame_round_trips(pd.DataFrame({1: [1.0], 2: [2.0]}), _PICKLE_TAG)
+    columns = pd.MultiIndex.from_tuples([('btc', 'price'), ('eth', 'price')])
+    _assert_frame_round_trips(pd.DataFrame([[1.0, 2.0]], columns=columns), _PICKLE_TAG)
+
+
+def test_index_names_and_types_round_trip():
+    _assert_frame_round_trips(pd.DataFrame({'a': [1.0]}, index=pd.RangeIndex(5, 6, name='row')), _MSGPACK_TAG)
+    _assert_frame_round_trips(pd.DataFrame({'a': [1.0, 2.0]}, index=pd.Index(['x', 'y'], name='coin')), _PICKLE_TAG)
+    _assert_frame_round_trips(
+        pd.DataFrame({'a': [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2, freq='D')),
+        _PICKLE_TAG
+    )
+
+
+def test_extension_dtypes_are_pickled():
+    _assert_frame_round_trips(pd.DataFrame({'coin': pd.Categorical(['btc', 'eth'])}), _PICKLE_TAG)
+    _assert_frame_round_trips(
+        pd.DataFrame({'ts': pd.date_range('2024-01-01', periods=2, tz='UTC')}),
+        _PICKLE_TAG
+    )
+    _assert_frame_round_trips(pd.DataFrame({'coin': ['btc', 'eth']}), _PICKLE_TAG)
+
+
+def test_containers_keep_their_types():
+    assert _round_trip({'a': (1, 2)}) == (_PICKLE_TAG, {'a': (1, 2)})
+    assert _round_trip({1: 'x'}) == (_MSGPACK_TAG, {1: 'x'})
+    tag, result = _round_trip(np.float64(1.5))
+    assert tag == _PICKLE_TAG and type(result) is np.float64
+
+
+if __name__ == "__main__":
+    tests = [
+        test_plain_frames_use_msgpack,
+        test_duplicate_columns_are_pickled,
+        test_non_str_and_multiindex_columns_are_pickled,
+        test_index_names_and_types_round_trip,
+        test_extension_dtypes_are_pickled,
+        test_containers_keep_their_types,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
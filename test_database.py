@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Test DatabaseManager price storage against a temporary SQLite database."""
+
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.database import DatabaseManager
+
+
+# price_history as created before timestamps were stored as epoch milliseconds
+_TEXT_SCHEMA = '''
+    CREATE TABLE price_history (
+        id INTEGER PRIMARY KEY,
+        coin_id TEXT NOT NULL,
+        timestamp DATETIME NOT NULL,
+        price REAL NOT NULL,
+        volume_24h REAL,
+        market_cap REAL,
+        source TEXT DEFAULT 'pyth',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _create_text_db(path: str, timestamps) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(_TEXT_SCHEMA)
+    conn.executemany(
+        "INSERT INTO price_history (coin_id, timestamp, price) VALUES ('bitcoin', ?, 100.0)",
+        [(timestamp,) for timestamp in timestamps]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _price(timestamp: datetime, price: float) -> dict:
+    return {'timestamp': timestamp, 'price': price, 'source': 'test'}
+
+
+def test_latest_price_ignores_older_insert_after_expiry():
+    """An older row inserted once the cached latest has expired must not become the latest."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "prices.db"))
+        now = datetime.now(timezone.utc)
+
+        # Cache the latest row with an already-expired entry, then backfill a point from 3 days ago
+        db.LATEST_TTL = 0
+        assert db.insert_price_data('bitcoin', _price(now, 100.0))
+        assert db.get_latest_price('bitcoin')['price'] == 100.0
+        db.LATEST_TTL = 60
+        assert db.insert_price_data('bitcoin', _price(now - timedelta(days=3), 50.0))
+
+        assert db.get_latest_price('bitcoin')['price'] == 100.0
+        assert db.get_latest_price('bitcoin')['price'] == 100.0
+        db.close()
+
+
+def test_latest_price_advances_on_newer_insert():
+    """A newer insert replaces the cached latest; an older one leaves it alone."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "prices.db"))
+        now = datetime.now(timezone.utc)
+
+        assert db.insert_price_data('bitcoin', _price(now, 100.0))
+        assert db.get_latest_price('bitcoin')['price'] == 100.0
+
+        assert db.insert_price_data('bitcoin', _price(now + timedelta(minutes=1), 101.0))
+        assert db.get_latest_price('bitcoin')['price'] == 101.0
+
+        assert db.insert_price_data('bitcoin', _price(now - timedelta(days=3), 50.0))
+        assert db.get_latest_price('bitcoin')['price'] == 101.0
+        db.close()
+
+
+def test_migration_keeps_unparseable_timestamps():
+    """Text timestamps are converted; ones that can't be read are set aside, not dropped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "prices.db")
+        _create_text_db(path, ['2024-01-01T00:00:00+00:00', '2024-01-02T00:00:00Z', 'not a date'])
+
+        db = DatabaseManager(path)
+        assert db.get_data_stats()['total_records'] == 2
+        assert db.get_price_range('bitcoin', '2024-01-01', '2024-01-03')[0]['timestamp'] == '2024-01-01T00:00:00.000+00:00'
+        db.close()
+
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT timestamp FROM price_history_invalid").fetchall() == [('not a date',)]
+        conn.close()
+
+
+def test_migration_converts_local_timestamps_to_utc():
+    """Offset-less timestamps were written as server local time and are shifted to UTC."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "prices.db")
+        local = datetime(2024, 1, 1, 12, 0)
+        _create_text_db(path, [local.isoformat()])
+
+        db = DatabaseManager(path)
+        expected = local.astimezone(timezone.utc).isoformat(timespec='milliseconds')
+        assert db.get_latest_price('bitcoin')['timestamp'] == expected
+        db.close()
+
+
+if __name__ == "__main__":
+    tests = [
+        test_latest_price_ignores_older_insert_after_expiry,
+        test_latest_price_advances_on_newer_insert,
+        test_migration_keeps_unparseable_timestamps,
+        test_migration_converts_local_timestamps_to_utc,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
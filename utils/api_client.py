@@ -4,12 +4,27 @@ Handles all cryptocurrency market data fetching.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
 from config.settings import settings
 from utils.exceptions import CoinGeckoAPIError, RateLimitError
 
@@ -18,6 +33,39 @@ logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _shared_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session for CoinGecko.
+    
+    Shared by every client instance so the keep-alive pool (and its TLS
+    connections) is reused across reruns and pages instead of rebuilt. When
+    requests-cache is installed, responses are also persisted to a SQLite
+    cache so repeat calls (including after a restart) skip the network.
+    """
+    if requests_cache is not None:
+        settings.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        session = requests_cache.CachedSession(
+            str(settings.CACHE_DIR / 'coingecko'),
+            backend='sqlite',
+            expire_after=timedelta(minutes=5),
+            allowable_codes=(200,),
+            urls_expire_after={
+                '*/coins/*/market_chart*': settings.CACHE_TTL_HISTORICAL,
+                '*/coins/markets*': settings.CACHE_TTL_PRICES,
+                '*/ping*': requests_cache.DO_NOT_CACHE,
+            }
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'CryptoInsight-Dashboard/1.0'
+    })
+    # Retries are handled in _make_request, so the adapter doesn't retry on its own
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
+    return session
+
+
 class CoinGeckoClient:
     """Client for interacting with CoinGecko API."""
     
@@ -28,33 +76,39 @@ class CoinGeckoClient:
         self.retry_attempts = settings.COINGECKO_RETRY_ATTEMPTS
         self.retry_delay = settings.COINGECKO_RETRY_DELAY
         self.rate_limit = settings.COINGECKO_RATE_LIMIT
-        self.last_request_time = 0
-        self.request_count = 0
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'CryptoInsight-Dashboard/1.0'
-        })
+        # Token bucket: holds up to rate_limit tokens, refilled continuously at rate_limit/minute
+        self._tokens = float(self.rate_limit)
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+        self.session = _shared_session()
     
     def _rate_limit_check(self):
-        """Enforce rate limiting."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        # Reset counter every minute
-        if time_since_last_request > 60:
-            self.request_count = 0
-            self.last_request_time = current_time
-        
-        # Check if we've exceeded rate limit
-        if self.request_count >= self.rate_limit:
-            sleep_time = 60 - time_since_last_request
-            if sleep_time > 0:
-                logger.warning(f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                self.request_count = 0
-                self.last_request_time = time.time()
+        """Enforce rate limiting (token bucket, safe to call from multiple threads)."""
+        with self._rate_lock:
+            now = time.monotonic()
+            refill_per_second = self.rate_limit / 60
+            self._tokens = min(
+                float(self.rate_limit),
+                self._tokens + (now - self._last_refill) * refill_per_second
+            )
+            self._last_refill = now
+            
+            # Reserve a token; a negative balance is the queue of callers still waiting
+            self._tokens -= 1
+            wait = -self._tokens / refill_per_second if self._tokens < 0 else 0.0
         
-        self.request_count += 1
+        if wait > 0:
+            logger.warning(f"Rate limit reached. Sleeping for {wait:.2f} seconds")
+            time.sleep(wait)
+    
+    def _cached_response(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
+        """Return a fresh response from the disk cache without touching the network, if there is one."""
+        if requests_cache is None or not isinstance(self.session, requests_cache.CachedSession):
+            return None
+        # only_if_cached answers 504 instead of sending a request when nothing usable is stored
+        # (only 200s are cached, so a 504 always means a miss)
+        response = self.session.get(url, params=params, only_if_cached=True)
+        return response if response.status_code != 504 else None
     
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """
@@ -75,15 +129,18 @@ class CoinGeckoClient:
         
         for attempt in range(self.retry_attempts):
             try:
-                # Enforce rate limiting
-                self._rate_limit_check()
-                
-                # Make request
-                response = self.session.get(
-                    url,
-                    params=params,
-                    timeout=self.timeout
-                )
+                # Responses served from the disk cache don't count against the API limit
+                response = self._cached_response(url, params)
+                if response is None:
+                    # Enforce rate limiting
+                    self._rate_limit_check()
+                    
+                    # Make request
+                    response = self.session.get(
+                        url,
+                        params=params,
+                        timeout=self.timeout
+                    )
                 
                 # Check for rate limit
                 if response.status_code == 429:
@@ -95,7 +152,7 @@ class CoinGeckoClient:
                 # Log successful request
                 logger.debug(f"Successfully fetched {endpoint}")
                 
-                return response.json()
+                return json_loads(response.content)
                 
             except requests.exceptions.Timeout:
                 logger.warning(f"Timeout on attempt {attempt + 1}/{self.retry_attempts}")
@@ -116,6 +173,10 @@ class CoinGeckoClient:
                     time.sleep(self.retry_delay * (2 ** attempt))
                 else:
                     raise CoinGeckoAPIError(f"Request failed after {self.retry_attempts} attempts: {e}")
+            
+            except ValueError as e:
+                logger.error(f"Invalid JSON response from {url}: {e}")
+                raise CoinGeckoAPIError(f"Invalid JSON response: {e}")
         
         raise CoinGeckoAPIError("Unexpected error in request handling")
     
@@ -195,18 +256,21 @@ class CoinGeckoClient:
             
             data = self._make_request(f'coins/{coin_id}/market_chart', params)
             
-            # Convert to DataFrame
-            df = pd.DataFrame({
-                'timestamp': [item[0] for item in data['prices']],
-                'price': [item[1] for item in data['prices']],
-                'market_cap': [item[1] for item in data['market_caps']],
-                'volume': [item[1] for item in data['total_volumes']]
-            })
+            # One NumPy conversion per series, then slice columns
+            prices = np.asarray(data['prices'], dtype=np.float64).reshape(-1, 2)
+            market_caps = np.asarray(data['market_caps'], dtype=np.float64).reshape(-1, 2)
+            volumes = np.asarray(data['total_volumes'], dtype=np.float64).reshape(-1, 2)
             
-            # Convert timestamp to datetime
-            df['date'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df = df.set_index('date')
-            df = df.drop('timestamp', axis=1)
+            # Build the DataFrame with its datetime index in one step
+            dates = pd.DatetimeIndex(
+                pd.to_datetime(prices[:, 0].astype(np.int64), unit='ms'),
+                name='date'
+            )
+            df = pd.DataFrame({
+                'price': prices[:, 1],
+                'market_cap': market_caps[:, 1],
+                'volume': volumes[:, 1]
+            }, index=dates)
             
             return df
             
@@ -214,6 +278,30 @@ class CoinGeckoClient:
             logger.error(f"Error fetching historical data for {coin_id}: {e}")
             raise CoinGeckoAPIError(f"Failed to fetch historical data: {e}")
     
+    def get_historical_data_many(self, coin_ids: List[str], days: int = 30,
+                                 max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+        """
+        Get historical price data for several cryptocurrencies concurrently.
+        
+        Requests run on a thread pool over the shared session, so total latency is
+        roughly the slowest request rather than the sum; the token bucket still
+        applies to every request.
+        
+        Args:
+            coin_ids: List of CoinGecko coin IDs
+            days: Number of days of historical data (1-365)
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            Dictionary mapping coin IDs to DataFrames (see get_historical_data)
+        """
+        if not coin_ids:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(coin_ids))) as executor:
+            frames = executor.map(lambda coin_id: self.get_historical_data(coin_id, days), coin_ids)
+            return dict(zip(coin_ids, frames))
+    
     def get_trending_coins(self) -> List[Dict]:
         """
         Get list of trending cryptocurrencies.
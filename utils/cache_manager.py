@@ -4,13 +4,30 @@ Provides smart caching with configurable TTL and statistics tracking.
 """
 
 import redis
+import atexit
 import pickle
 import logging
 import functools
-from typing import Any, Optional, Callable
-from datetime import datetime, timedelta
+import inspect
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Callable, Tuple
 import time
 
+import numpy as np
+import pandas as pd
+
+try:
+    import msgpack
+except ImportError:  # optional: values are pickled instead
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: DataFrames are packed column by column instead
+    pa = None
+
 from config.settings import settings
 from utils.exceptions import CacheError
 
@@ -18,33 +35,182 @@ from utils.exceptions import CacheError
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# One connection pool per process; threads wait (up to `timeout` seconds)
+# for a free connection instead of opening unbounded sockets
+_POOL = redis.BlockingConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    password=settings.REDIS_PASSWORD,
+    decode_responses=False,  # We'll handle encoding/decoding
+    socket_timeout=5,
+    socket_connect_timeout=5,
+    max_connections=64,
+    timeout=5
+)
+atexit.register(_POOL.disconnect)
+
+# msgpack extension type codes
+_EXT_DATAFRAME = 1
+_EXT_NDARRAY = 2
+_EXT_ARROW = 3
+
+
+def _arrow_bytes(df: pd.DataFrame) -> bytes:
+    """Write a DataFrame as an LZ4-compressed Arrow IPC stream."""
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression='lz4')
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _frame_packs_losslessly(df: pd.DataFrame) -> bool:
+    """
+    Check that a DataFrame survives the msgpack/Arrow encoding exactly.
+    
+    Anything else (duplicate, non-str or MultiIndex columns, object, categorical or
+    tz-aware dtypes, other index types) is left to pickle.
+    """
+    columns = df.columns
+    if type(columns) is not pd.Index or not columns.is_unique or not all(type(c) is str for c in columns):
+        return False
+    if not all(isinstance(dtype, np.dtype) and dtype.kind in 'biufM' for dtype in df.dtypes):
+        return False
+    index = df.index
+    if type(index) is pd.DatetimeIndex:
+        if index.tz is not None or index.freq is not None:
+            return False
+    elif type(index) is not pd.RangeIndex:
+        return False
+    return index.name is None or type(index.name) is str
+
+
+def _encode_ext(obj: Any) -> Any:
+    """Encode the non-native types msgpack meets in cached values."""
+    if type(obj) is pd.DataFrame:
+        if not _frame_packs_losslessly(obj):
+            raise TypeError("DataFrame does not round-trip through msgpack")
+        if pa is not None:
+            try:
+                return msgpack.ExtType(_EXT_ARROW, _arrow_bytes(obj))
+            except (pa.ArrowException, ValueError, TypeError):
+                pass  # e.g. mixed-type object columns; pack the columns below
+        index = obj.index
+        payload = [
+            list(obj.columns),
+            index.name,
+            [index.start, index.stop, index.step] if type(index) is pd.RangeIndex else index.to_numpy(),
+            [obj[column].to_numpy() for column in obj.columns]
+        ]
+        return msgpack.ExtType(_EXT_DATAFRAME, msgpack.packb(payload, use_bin_type=True, strict_types=True,
+                                                            default=_encode_ext))
+    if type(obj) is np.ndarray:
+        if obj.dtype.kind not in 'biufcmM':
+            raise TypeError(f"{obj.dtype} arrays are not msgpack-serializable")
+        payload = [obj.dtype.str, list(obj.shape), obj.tobytes()]
+        return msgpack.ExtType(_EXT_NDARRAY, msgpack.packb(payload, use_bin_type=True))
+    raise TypeError(f"Cannot msgpack-serialize {type(obj).__name__}")
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    """Reverse ``_encode_ext``."""
+    if code == _EXT_DATAFRAME:
+        columns, index_name, index, values = msgpack.unpackb(data, raw=False, ext_hook=_decode_ext)
+        if isinstance(index, list):
+            index = pd.RangeIndex(*index, name=index_name)
+        else:
+            index = pd.Index(index, name=index_name)
+        return pd.DataFrame(dict(zip(columns, values)), index=index, columns=columns)
+    if code == _EXT_ARROW:
+        return pa.ipc.open_stream(data).read_all().to_pandas()
+    if code == _EXT_NDARRAY:
+        dtype, shape, buffer = msgpack.unpackb(data, raw=False)
+        # Copy so callers get a writable array, as they did with pickle
+        return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape).copy()
+    return msgpack.ExtType(code, data)
+
+
+# Every payload starts with this marker and a one-byte format code. 0xC1 is never
+# the first byte of a pickle, so untagged values are ones written by older pickle-only code
+_PRIMITIVE_TAG = b'\xc1'
+_MSGPACK_TAG = _PRIMITIVE_TAG + b'm'
+_PICKLE_TAG = _PRIMITIVE_TAG + b'p'
+
+
+def _serialize(value: Any) -> bytes:
+    """
+    Serialize a value for Redis (msgpack when it round-trips losslessly, pickle otherwise).
+    
+    msgpack is packed with ``strict_types`` so tuples, subclasses (e.g. OrderedDict,
+    NumPy scalars) and other types it would silently convert are pickled instead.
+    """
+    # Scalars skip the generic serializers: a tag, a type code and the raw value
+    value_type = type(value)
+    if value_type is float:
+        return _PRIMITIVE_TAG + b'f' + struct.pack('<d', value)
+    if value_type is int:
+        return _PRIMITIVE_TAG + b'i' + str(value).encode()
+    if value_type is str:
+        return _PRIMITIVE_TAG + b's' + value.encode()
+    if value_type is bytes:
+        return _PRIMITIVE_TAG + b'b' + value
+    
+    if msgpack is not None:
+        try:
+            return _MSGPACK_TAG + msgpack.packb(value, use_bin_type=True, strict_types=True, default=_encode_ext)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return _PICKLE_TAG + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _deserialize(data: bytes) -> Any:
+    """Deserialize a Redis value written by ``_serialize`` (or by older pickle-only code)."""
+    if data[:1] == _PRIMITIVE_TAG:
+        code, raw = data[1:2], data[2:]
+        if code == b'f':
+            return struct.unpack('<d', raw)[0]
+        if code == b'i':
+            return int(raw)
+        if code == b's':
+            return raw.decode()
+        if code == b'b':
+            return raw
+        if code == b'm':
+            # Non-str keys (e.g. ints) are packed as-is, so accept them back
+            return msgpack.unpackb(raw, raw=False, strict_map_key=False, ext_hook=_decode_ext)
+        if code == b'p':
+            return pickle.loads(raw)
+    return pickle.loads(data)
+
 
 class CacheManager:
     """Manages caching with Redis backend and in-memory fallback."""
     
+    # Max entries in the process-local LRU kept in front of Redis
+    L1_MAX = 1024
+    # Max entries in the in-memory fallback used while Redis is unavailable
+    L2_MAX = 10_000
+    
     def __init__(self):
         """Initialize cache manager with Redis connection."""
         self.redis_client = None
-        self.in_memory_cache = {}
-        self.cache_stats = {
-            'hits': 0,
-            'misses': 0,
-            'errors': 0
-        }
+        # key -> (expires_at monotonic seconds, value), least recently used first
+        self.in_memory_cache = OrderedDict()
+        # key -> (expires_at monotonic seconds, serialized value), least recently used first.
+        # Entries stay serialized so every hit decodes a fresh copy callers are free to mutate
+        self._l1 = OrderedDict()
+        self._l1_lock = threading.Lock()
+        # Guards cache_stats; `+=` on a dict entry is not atomic across threads
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
         self._connect_redis()
     
     def _connect_redis(self):
         """Establish connection to Redis server."""
         try:
-            self.redis_client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
-                password=settings.REDIS_PASSWORD,
-                decode_responses=False,  # We'll handle encoding/decoding
-                socket_timeout=5,
-                socket_connect_timeout=5
-            )
+            self.redis_client = redis.Redis(connection_pool=_POOL)
             # Test connection
             self.redis_client.ping()
             logger.info("Successfully connected to Redis")
@@ -52,6 +218,33 @@ class CacheManager:
             logger.warning(f"Failed to connect to Redis: {e}. Using in-memory cache as fallback.")
             self.redis_client = None
     
+    def _l1_get(self, key: str) -> Optional[bytes]:
+        """Get a live serialized value from the process-local LRU."""
+        with self._l1_lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            return entry[1]
+    
+    def _l1_put(self, key: str, payload: bytes, ttl: float):
+        """Store a serialized value in the process-local LRU, evicting the oldest entry when full."""
+        with self._l1_lock:
+            self._l1[key] = (time.monotonic() + ttl, payload)
+            self._l1.move_to_end(key)
+            if len(self._l1) > self.L1_MAX:
+                self._l1.popitem(last=False)
+    
+    def _memory_put(self, key: str, value: Any, expires_at: float):
+        """Store a value in the in-memory fallback, evicting least recently used entries past L2_MAX."""
+        self.in_memory_cache[key] = (expires_at, value)
+        self.in_memory_cache.move_to_end(key)
+        while len(self.in_memory_cache) > self.L2_MAX:
+            self.in_memory_cache.popitem(last=False)
+    
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache.
@@ -63,33 +256,46 @@ class CacheManager:
             Cached value or None if not found
         """
         try:
-            # Try Redis first
+            # Hot keys are served from the local LRU without a round trip
+            payload = self._l1_get(key)
+            if payload is not None:
+                self._record('hits')
+                return _deserialize(payload)
+            
+            # Then Redis
             if self.redis_client:
                 try:
-                    value = self.redis_client.get(key)
+                    # Fetch the remaining TTL in the same round trip so the L1 copy expires with it
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.get(key)
+                    pipe.pttl(key)
+                    value, pttl = pipe.execute()
                     if value is not None:
-                        self.cache_stats['hits'] += 1
-                        return pickle.loads(value)
+                        self._record('hits')
+                        if pttl > 0:
+                            self._l1_put(key, value, pttl / 1000)
+                        return _deserialize(value)
                 except Exception as e:
                     logger.error(f"Redis get error: {e}")
-                    self.cache_stats['errors'] += 1
+                    self._record('errors')
             
             # Fallback to in-memory cache
             if key in self.in_memory_cache:
-                entry = self.in_memory_cache[key]
-                if entry['expires_at'] > datetime.now():
-                    self.cache_stats['hits'] += 1
-                    return entry['value']
+                expires_at, value = self.in_memory_cache[key]
+                if expires_at > time.monotonic():
+                    self.in_memory_cache.move_to_end(key)
+                    self._record('hits')
+                    return value
                 else:
                     # Expired, remove it
                     del self.in_memory_cache[key]
             
-            self.cache_stats['misses'] += 1
+            self._record('misses')
             return None
             
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
-            self.cache_stats['errors'] += 1
+            self._record('errors')
             return None
     
     def set(self, key: str, value: Any, ttl: int = 300):
@@ -102,25 +308,125 @@ class CacheManager:
             ttl: Time to live in seconds
         """
         try:
+            try:
+                serialized = _serialize(value)
+            except Exception as e:
+                logger.error(f"Cache serialize error for key {key}: {e}")
+                self._record('errors')
+                serialized = None
+            
             # Try Redis first
-            if self.redis_client:
+            if serialized is not None:
+                self._l1_put(key, serialized, ttl)
+                if self.redis_client:
+                    try:
+                        self.redis_client.setex(key, ttl, serialized)
+                        return
+                    except Exception as e:
+                        logger.error(f"Redis set error: {e}")
+                        self._record('errors')
+            
+            # Fallback to in-memory cache
+            self._memory_put(key, value, time.monotonic() + ttl)
+            
+        except Exception as e:
+            logger.error(f"Cache set error for key {key}: {e}")
+            self._record('errors')
+    
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several values from cache in one Redis round trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Cached values (None where not found), in the order of ``keys``
+        """
+        try:
+            payloads = [self._l1_get(key) for key in keys]
+            values = [None if payload is None else _deserialize(payload) for payload in payloads]
+            pending = [i for i, payload in enumerate(payloads) if payload is None]
+            
+            if self.redis_client and pending:
+                try:
+                    # Remaining TTLs come back in the same round trip, as in get()
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for i in pending:
+                        pipe.get(keys[i])
+                        pipe.pttl(keys[i])
+                    results = pipe.execute()
+                    for i, value, pttl in zip(pending, results[::2], results[1::2]):
+                        if value is not None:
+                            if pttl > 0:
+                                self._l1_put(keys[i], value, pttl / 1000)
+                            values[i] = _deserialize(value)
+                except Exception as e:
+                    logger.error(f"Redis mget error: {e}")
+                    self._record('errors')
+            
+            # Fill remaining keys from the in-memory cache
+            now = time.monotonic()
+            for i, key in enumerate(keys):
+                if values[i] is None and key in self.in_memory_cache:
+                    expires_at, value = self.in_memory_cache[key]
+                    if expires_at > now:
+                        self.in_memory_cache.move_to_end(key)
+                        values[i] = value
+                    else:
+                        del self.in_memory_cache[key]
+            
+            hits = sum(value is not None for value in values)
+            self._record('hits', hits)
+            self._record('misses', len(keys) - hits)
+            return values
+            
+        except Exception as e:
+            logger.error(f"Cache mget error: {e}")
+            self._record('errors')
+            return [None] * len(keys)
+    
+    def mset(self, mapping: Dict[str, Any], ttl: int = 300):
+        """
+        Set several values in cache with one Redis round trip.
+        
+        Args:
+            mapping: Cache keys to values
+            ttl: Time to live in seconds
+        """
+        if not mapping:
+            return
+        try:
+            try:
+                serialized = {key: _serialize(value) for key, value in mapping.items()}
+            except Exception as e:
+                logger.error(f"Cache serialize error: {e}")
+                self._record('errors')
+                serialized = None
+            
+            if serialized is not None:
+                for key, payload in serialized.items():
+                    self._l1_put(key, payload, ttl)
+            
+            if serialized is not None and self.redis_client:
                 try:
-                    serialized = pickle.dumps(value)
-                    self.redis_client.setex(key, ttl, serialized)
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for key, payload in serialized.items():
+                        pipe.setex(key, ttl, payload)
+                    pipe.execute()
                     return
                 except Exception as e:
-                    logger.error(f"Redis set error: {e}")
-                    self.cache_stats['errors'] += 1
+                    logger.error(f"Redis mset error: {e}")
+                    self._record('errors')
             
             # Fallback to in-memory cache
-            self.in_memory_cache[key] = {
-                'value': value,
-                'expires_at': datetime.now() + timedelta(seconds=ttl)
-            }
+            expires_at = time.monotonic() + ttl
+            for key, value in mapping.items():
+                self._memory_put(key, value, expires_at)
             
         except Exception as e:
-            logger.error(f"Cache set error for key {key}: {e}")
-            self.cache_stats['errors'] += 1
+            logger.error(f"Cache mset error: {e}")
+            self._record('errors')
     
     def delete(self, key: str):
         """
@@ -130,6 +436,9 @@ class CacheManager:
             key: Cache key to delete
         """
         try:
+            with self._l1_lock:
+                self._l1.pop(key, None)
+            
             if self.redis_client:
                 try:
                     self.redis_client.delete(key)
@@ -154,14 +463,21 @@ class CacheManager:
             if self.redis_client:
                 try:
                     if pattern:
-                        keys = self.redis_client.keys(pattern)
-                        if keys:
-                            self.redis_client.delete(*keys)
+                        # SCAN in batches rather than KEYS, which blocks the server on large keyspaces
+                        pipe = self.redis_client.pipeline(transaction=False)
+                        for i, key in enumerate(self.redis_client.scan_iter(match=pattern, count=500), 1):
+                            pipe.delete(key)
+                            if i % 500 == 0:
+                                pipe.execute()
+                        pipe.execute()
                     else:
                         self.redis_client.flushdb()
                 except Exception as e:
                     logger.error(f"Redis clear error: {e}")
             
+            with self._l1_lock:
+                self._l1.clear()
+            
             # Clear in-memory cache
             if pattern:
                 keys_to_delete = [k for k in self.in_memory_cache.keys() if pattern.replace('*', '') in k]
@@ -182,24 +498,32 @@ class CacheManager:
         Returns:
             Dictionary with cache hit/miss/error counts and hit rate
         """
-        total_requests = self.cache_stats['hits'] + self.cache_stats['misses']
-        hit_rate = (self.cache_stats['hits'] / total_requests * 100) if total_requests > 0 else 0
+        with self._stats_lock:
+            hits, misses, errors = (self.cache_stats[stat] for stat in ('hits', 'misses', 'errors'))
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
         
         return {
-            'hits': self.cache_stats['hits'],
-            'misses': self.cache_stats['misses'],
-            'errors': self.cache_stats['errors'],
+            'hits': hits,
+            'misses': misses,
+            'errors': errors,
             'hit_rate': f"{hit_rate:.2f}%",
             'total_requests': total_requests
         }
     
+    def _record(self, stat: str, n: int = 1):
+        """Add ``n`` to a cache statistic."""
+        with self._stats_lock:
+            self.cache_stats[stat] += n
+    
     def reset_stats(self):
         """Reset cache statistics."""
-        self.cache_stats = {
-            'hits': 0,
-            'misses': 0,
-            'errors': 0
-        }
+        with self._stats_lock:
+            self.cache_stats = {
+                'hits': 0,
+                'misses': 0,
+                'errors': 0
+            }
     
     def is_connected(self) -> bool:
         """Check if Redis is connected."""
@@ -216,6 +540,41 @@ class CacheManager:
 cache_manager = CacheManager()
 
 
+def _key_builder(key_prefix: str, func: Callable) -> Callable[[tuple, dict], str]:
+    """
+    Build the cache-key function for a decorated function.
+    
+    The static ``key_prefix:func_name`` part is joined once at decoration time;
+    each call only formats its own arguments. Functions taking a fixed number of
+    plain positional parameters get a key template specialized to that arity, so
+    the common call is a single ``str.format``.
+    """
+    prefix = ":".join(filter(None, (key_prefix, func.__name__)))
+    
+    def make_key(args: tuple, kwargs: dict) -> str:
+        if not kwargs:
+            return ":".join((prefix, *map(str, args)))
+        return ":".join((prefix, *map(str, args), *[f"{k}={v}" for k, v in sorted(kwargs.items())]))
+    
+    try:
+        params = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return make_key
+    positional = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    if not all(p.kind in positional and p.default is p.empty for p in params):
+        return make_key
+    
+    arity = len(params)
+    template = prefix.replace('{', '{{').replace('}', '}}') + ':{}' * arity
+    
+    def make_fixed_key(args: tuple, kwargs: dict) -> str:
+        if kwargs or len(args) != arity:
+            return make_key(args, kwargs)
+        return template.format(*args)
+    
+    return make_fixed_key
+
+
 def cached(ttl: int = 300, key_prefix: str = ""):
     """
     Decorator for caching function results.
@@ -228,29 +587,47 @@ def cached(ttl: int = 300, key_prefix: str = ""):
         @cached(ttl=120, key_prefix="prices")
         def get_prices(coin_id):
             return fetch_prices(coin_id)
+        
+        # Several calls with one cache round trip each way
+        btc, eth = get_prices.many([("bitcoin",), ("ethereum",)])
     """
     def decorator(func: Callable) -> Callable:
+        make_key = _key_builder(key_prefix, func)
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            key_parts = [key_prefix, func.__name__]
-            key_parts.extend([str(arg) for arg in args])
-            key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items())])
-            cache_key = ":".join(filter(None, key_parts))
+            cache_key = make_key(args, kwargs)
             
             # Try to get from cache
             cached_value = cache_manager.get(cache_key)
             if cached_value is not None:
-                logger.debug(f"Cache hit for {cache_key}")
+                logger.debug("Cache hit for %s", cache_key)
                 return cached_value
             
             # Execute function and cache result
-            logger.debug(f"Cache miss for {cache_key}, executing function")
+            logger.debug("Cache miss for %s, executing function", cache_key)
             result = func(*args, **kwargs)
             cache_manager.set(cache_key, result, ttl)
             
             return result
         
+        def many(calls: Iterable[Tuple], **kwargs) -> List[Any]:
+            """Call ``func`` once per args tuple, reading and writing the cache in batches."""
+            calls = list(calls)
+            keys = [make_key(args, kwargs) for args in calls]
+            results = cache_manager.mget(keys)
+            
+            fresh = {}
+            for i, args in enumerate(calls):
+                if results[i] is None:
+                    results[i] = func(*args, **kwargs)
+                    fresh[keys[i]] = results[i]
+            cache_manager.mset(fresh, ttl)
+            
+            return results
+        
+        wrapper.many = many
         return wrapper
     return decorator
 
@@ -270,14 +647,12 @@ def cache_with_refresh(ttl: int = 300, key_prefix: str = "", force_refresh: bool
             return fetch_prices(coin_id)
     """
     def decorator(func: Callable) -> Callable:
+        make_key = _key_builder(key_prefix, func)
+        
         @functools.wraps(func)
         def wrapper(*args, force_refresh=False, **kwargs):
-            # Generate cache key
-            key_parts = [key_prefix, func.__name__]
-            key_parts.extend([str(arg) for arg in args])
-            # Exclude force_refresh from cache key
-            key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items()) if k != 'force_refresh'])
-            cache_key = ":".join(filter(None, key_parts))
+            # Generate cache key (force_refresh is a keyword-only flag, never part of it)
+            cache_key = make_key(args, kwargs)
             
             # If force refresh, delete cache and fetch fresh
             if force_refresh:
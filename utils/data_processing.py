@@ -8,6 +8,11 @@ import numpy as np
 import logging
 from typing import Optional, List, Tuple
 
+try:
+    from numba import njit
+except ImportError:  # optional: MACD falls back to pandas ewm
+    njit = None
+
 from config.settings import settings
 from utils.exceptions import DataProcessingError
 
@@ -16,6 +21,12 @@ logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
 
+def _add_moving_averages(df: pd.DataFrame, periods: List[int]):
+    """Add MA columns to ``df`` in place."""
+    for period in periods:
+        df[f'ma_{period}'] = df['price'].rolling(window=period).mean()
+
+
 def calculate_moving_averages(df: pd.DataFrame, periods: List[int] = [7, 30, 90]) -> pd.DataFrame:
     """
     Calculate moving averages for given periods.
@@ -29,14 +40,35 @@ def calculate_moving_averages(df: pd.DataFrame, periods: List[int] = [7, 30, 90]
     """
     try:
         df = df.copy()
-        for period in periods:
-            df[f'ma_{period}'] = df['price'].rolling(window=period).mean()
+        _add_moving_averages(df, periods)
         return df
     except Exception as e:
         logger.error(f"Error calculating moving averages: {e}")
         raise DataProcessingError(f"Failed to calculate moving averages: {e}")
 
 
+def _add_rsi(df: pd.DataFrame, period: int):
+    """Add the 'rsi' column to ``df`` in place."""
+    prices = df['price'].to_numpy(dtype=np.float64)
+    rsi = np.full(len(prices), np.nan)
+    
+    if len(prices) >= period:
+        # Calculate price changes (the first one, like a NaN change, counts as 0)
+        delta = np.diff(prices, prepend=np.nan)
+        
+        # Separate gains and losses and sum them over each window
+        # (RS is a ratio of two means over the same window, so sums suffice)
+        windows = np.lib.stride_tricks.sliding_window_view
+        gain = windows(np.where(delta > 0, delta, 0.0), period).sum(axis=1)
+        loss = windows(np.where(delta < 0, -delta, 0.0), period).sum(axis=1)
+        
+        # Calculate RS and RSI
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi[period - 1:] = 100 - (100 / (1 + gain / loss))
+    
+    df['rsi'] = rsi
+
+
 def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """
     Calculate Relative Strength Index (RSI).
@@ -50,24 +82,56 @@ def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """
     try:
         df = df.copy()
-        
-        # Calculate price changes
-        delta = df['price'].diff()
-        
-        # Separate gains and losses
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        # Calculate RS and RSI
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
+        _add_rsi(df, period)
         return df
     except Exception as e:
         logger.error(f"Error calculating RSI: {e}")
         raise DataProcessingError(f"Failed to calculate RSI: {e}")
 
 
+def _macd_loop(prices: np.ndarray, alpha_fast: float, alpha_slow: float, alpha_signal: float) -> np.ndarray:
+    """Walk the prices once, updating the fast, slow and signal EMAs (ewm adjust=False) together."""
+    out = np.empty((len(prices), 3))
+    ema_fast = ema_slow = prices[0]
+    ema_signal = 0.0  # the first MACD value is always 0
+    for i in range(len(prices)):
+        ema_fast = alpha_fast * prices[i] + (1 - alpha_fast) * ema_fast
+        ema_slow = alpha_slow * prices[i] + (1 - alpha_slow) * ema_slow
+        macd = ema_fast - ema_slow
+        ema_signal = alpha_signal * macd + (1 - alpha_signal) * ema_signal
+        out[i, 0] = macd
+        out[i, 1] = ema_signal
+        out[i, 2] = macd - ema_signal
+    return out
+
+
+_macd_kernel = njit(cache=True)(_macd_loop) if njit is not None else None
+
+
+def _add_macd(df: pd.DataFrame, fast: int, slow: int, signal: int):
+    """Add the MACD columns to ``df`` in place."""
+    prices = df['price'].to_numpy(dtype=np.float64)
+    if _macd_kernel is not None and len(prices) and not np.isnan(prices).any():
+        out = _macd_kernel(prices, 2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+        df['macd'] = out[:, 0]
+        df['macd_signal'] = out[:, 1]
+        df['macd_histogram'] = out[:, 2]
+        return
+    
+    # Calculate EMAs
+    ema_fast = df['price'].ewm(span=fast, adjust=False).mean()
+    ema_slow = df['price'].ewm(span=slow, adjust=False).mean()
+    
+    # Calculate MACD line
+    df['macd'] = ema_fast - ema_slow
+    
+    # Calculate signal line
+    df['macd_signal'] = df['macd'].ewm(span=signal, adjust=False).mean()
+    
+    # Calculate histogram
+    df['macd_histogram'] = df['macd'] - df['macd_signal']
+
+
 def calculate_macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
     """
     Calculate MACD (Moving Average Convergence Divergence).
@@ -83,26 +147,25 @@ def calculate_macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int
     """
     try:
         df = df.copy()
-        
-        # Calculate EMAs
-        ema_fast = df['price'].ewm(span=fast, adjust=False).mean()
-        ema_slow = df['price'].ewm(span=slow, adjust=False).mean()
-        
-        # Calculate MACD line
-        df['macd'] = ema_fast - ema_slow
-        
-        # Calculate signal line
-        df['macd_signal'] = df['macd'].ewm(span=signal, adjust=False).mean()
-        
-        # Calculate histogram
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
-        
+        _add_macd(df, fast, slow, signal)
         return df
     except Exception as e:
         logger.error(f"Error calculating MACD: {e}")
         raise DataProcessingError(f"Failed to calculate MACD: {e}")
 
 
+def _add_bollinger_bands(df: pd.DataFrame, period: int, std_dev: int):
+    """Add the Bollinger Band columns to ``df`` in place."""
+    # Calculate middle band (SMA) and standard deviation from one rolling window
+    stats = df['price'].rolling(window=period).agg(['mean', 'std'])
+    df['bb_middle'] = stats['mean']
+    std = stats['std']
+    
+    # Calculate upper and lower bands
+    df['bb_upper'] = df['bb_middle'] + (std * std_dev)
+    df['bb_lower'] = df['bb_middle'] - (std * std_dev)
+
+
 def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, std_dev: int = 2) -> pd.DataFrame:
     """
     Calculate Bollinger Bands.
@@ -117,17 +180,7 @@ def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, std_dev: int =
     """
     try:
         df = df.copy()
-        
-        # Calculate middle band (SMA)
-        df['bb_middle'] = df['price'].rolling(window=period).mean()
-        
-        # Calculate standard deviation
-        std = df['price'].rolling(window=period).std()
-        
-        # Calculate upper and lower bands
-        df['bb_upper'] = df['bb_middle'] + (std * std_dev)
-        df['bb_lower'] = df['bb_middle'] - (std * std_dev)
-        
+        _add_bollinger_bands(df, period, std_dev)
         return df
     except Exception as e:
         logger.error(f"Error calculating Bollinger Bands: {e}")
@@ -155,6 +208,23 @@ def normalize_prices(df: pd.DataFrame, start_value: float = 100.0) -> pd.DataFra
         raise DataProcessingError(f"Failed to normalize prices: {e}")
 
 
+def _add_returns(df: pd.DataFrame, periods: List[int]):
+    """Add return columns to ``df`` in place."""
+    prices = df['price']
+    # pct_change forward-fills gaps before dividing; do the same once for every period
+    if prices.isna().any():
+        prices = prices.ffill()
+    prices = prices.to_numpy(dtype=np.float64)
+    
+    for period in periods:
+        returns = np.full(len(prices), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(prices[period:], prices[:-period], out=returns[period:])
+        returns[period:] -= 1
+        returns[period:] *= 100
+        df[f'return_{period}d'] = returns
+
+
 def calculate_returns(df: pd.DataFrame, periods: List[int] = [1, 7, 30]) -> pd.DataFrame:
     """
     Calculate returns for different periods.
@@ -168,14 +238,19 @@ def calculate_returns(df: pd.DataFrame, periods: List[int] = [1, 7, 30]) -> pd.D
     """
     try:
         df = df.copy()
-        for period in periods:
-            df[f'return_{period}d'] = df['price'].pct_change(periods=period) * 100
+        _add_returns(df, periods)
         return df
     except Exception as e:
         logger.error(f"Error calculating returns: {e}")
         raise DataProcessingError(f"Failed to calculate returns: {e}")
 
 
+def _add_volatility(df: pd.DataFrame, window: int):
+    """Add the 'volatility' column to ``df`` in place."""
+    returns = df['price'].pct_change()
+    df['volatility'] = returns.rolling(window=window).std() * np.sqrt(365) * 100
+
+
 def calculate_volatility(df: pd.DataFrame, window: int = 30) -> pd.DataFrame:
     """
     Calculate rolling volatility (standard deviation of returns).
@@ -189,8 +264,7 @@ def calculate_volatility(df: pd.DataFrame, window: int = 30) -> pd.DataFrame:
     """
     try:
         df = df.copy()
-        returns = df['price'].pct_change()
-        df['volatility'] = returns.rolling(window=window).std() * np.sqrt(365) * 100
+        _add_volatility(df, window)
         return df
     except Exception as e:
         logger.error(f"Error calculating volatility: {e}")
@@ -209,22 +283,20 @@ def detect_support_resistance(df: pd.DataFrame, window: int = 20) -> Tuple[float
         Tuple of (support_level, resistance_level)
     """
     try:
-        prices = df['price'].values
-        
-        # Find local minima (support)
-        local_min = []
-        for i in range(window, len(prices) - window):
-            if prices[i] == min(prices[i-window:i+window+1]):
-                local_min.append(prices[i])
+        prices = df['price'].to_numpy()
         
-        # Find local maxima (resistance)
-        local_max = []
-        for i in range(window, len(prices) - window):
-            if prices[i] == max(prices[i-window:i+window+1]):
-                local_max.append(prices[i])
+        # Centered windows of 2*window+1 prices for every i in [window, len - window)
+        size = 2 * window + 1
+        if len(prices) >= size:
+            windows = np.lib.stride_tricks.sliding_window_view(prices, size)
+            centers = prices[window:len(prices) - window]
+            local_min = centers[centers == windows.min(axis=1)]  # support
+            local_max = centers[centers == windows.max(axis=1)]  # resistance
+        else:
+            local_min = local_max = prices[:0]
         
-        support = np.mean(local_min) if local_min else df['price'].min()
-        resistance = np.mean(local_max) if local_max else df['price'].max()
+        support = local_min.mean() if local_min.size else df['price'].min()
+        resistance = local_max.mean() if local_max.size else df['price'].max()
         
         return support, resistance
     except Exception as e:
@@ -243,23 +315,26 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
         Cleaned DataFrame
     """
     try:
-        df = df.copy()
+        # Remove duplicates (only filter when there are any)
+        duplicated = df.index.duplicated(keep='first')
+        if duplicated.any():
+            df = df[~duplicated]
         
-        # Remove duplicates
-        df = df[~df.index.duplicated(keep='first')]
+        # Sort by index (date), unless it already is
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
         
-        # Sort by index (date)
-        df = df.sort_index()
-        
-        # Forward fill missing values
-        df = df.fillna(method='ffill')
+        # Forward fill missing values (a new frame, so the caller's is never modified below)
+        df = df.ffill()
         
         # Remove any remaining NaN values
-        df = df.dropna()
+        df.dropna(inplace=True)
         
-        # Ensure positive prices
+        # Ensure positive prices (in place too, so callers can add columns without another copy)
         if 'price' in df.columns:
-            df = df[df['price'] > 0]
+            non_positive = df['price'].to_numpy() <= 0
+            if non_positive.any():
+                df.drop(index=df.index[non_positive], inplace=True)
         
         return df
     except Exception as e:
@@ -290,16 +365,13 @@ def prepare_lstm_data(df: pd.DataFrame, sequence_length: int = 60,
         scaler = MinMaxScaler(feature_range=(0, 1))
         scaled_prices = scaler.fit_transform(prices)
         
-        # Create sequences
-        X, y = [], []
-        for i in range(sequence_length, len(scaled_prices)):
-            X.append(scaled_prices[i-sequence_length:i, 0])
-            y.append(scaled_prices[i, 0])
-        
-        X, y = np.array(X), np.array(y)
+        # Create sequences: row i is the window ending just before y[i] (a view, no copies)
+        windows = np.lib.stride_tricks.sliding_window_view(scaled_prices[:, 0], sequence_length)
+        X = windows[:-1]
+        y = scaled_prices[sequence_length:, 0]
         
         # Reshape for LSTM [samples, time steps, features]
-        X = np.reshape(X, (X.shape[0], X.shape[1], 1))
+        X = X[..., np.newaxis]
         
         # Split into train and test
         split_idx = int(len(X) * train_split)
@@ -324,13 +396,14 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
         DataFrame with all indicators
     """
     try:
+        # clean_data returns a new frame, so the indicators add columns to it in place
         df = clean_data(df)
-        df = calculate_moving_averages(df)
-        df = calculate_rsi(df)
-        df = calculate_macd(df)
-        df = calculate_bollinger_bands(df)
-        df = calculate_returns(df)
-        df = calculate_volatility(df)
+        _add_moving_averages(df, [7, 30, 90])
+        _add_rsi(df, 14)
+        _add_macd(df, 12, 26, 9)
+        _add_bollinger_bands(df, 20, 2)
+        _add_returns(df, [1, 7, 30])
+        _add_volatility(df, 30)
         
         return df
     except Exception as e:
@@ -338,6 +411,116 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
         raise DataProcessingError(f"Failed to calculate all indicators: {e}")
 
 
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets (LTTB) downsampling.
+    
+    Args:
+        x: Monotonically increasing x values (e.g. epoch nanoseconds)
+        y: Values to downsample
+        n_out: Number of points to keep
+        
+    Returns:
+        Sorted array of selected indices into x/y
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Triangle area between the last selected point, each candidate and the next bucket's average
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    
+    return selected
+
+
+def minmax_lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int, minmax_ratio: int = 4) -> np.ndarray:
+    """
+    Select points with MinMaxLTTB downsampling.
+    
+    Preselects the min and max of each of ``n_out * minmax_ratio / 2`` equal buckets
+    (a cheap vectorized pass), then runs LTTB on the reduced candidate set.
+    
+    Args:
+        x: Monotonically increasing x values (e.g. epoch nanoseconds)
+        y: Values to downsample
+        n_out: Number of points to keep
+        minmax_ratio: Candidates kept per output point during preselection
+        
+    Returns:
+        Sorted array of selected indices into x/y
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    n_buckets = n_out * minmax_ratio // 2
+    if 2 * n_buckets >= n - 2:
+        return lttb_indices(x, y, n_out)
+    
+    # Bucket the inner points (first and last are always kept)
+    inner = y[1:n - 1]
+    starts = np.linspace(0, n - 2, n_buckets + 1).astype(np.int64)
+    bucket_of = np.repeat(np.arange(n_buckets), np.diff(starts))
+    
+    mins = np.minimum.reduceat(inner, starts[:-1])
+    maxs = np.maximum.reduceat(inner, starts[:-1])
+    
+    # First occurrence of each bucket's min/max
+    is_min = np.flatnonzero(inner == mins[bucket_of])
+    is_max = np.flatnonzero(inner == maxs[bucket_of])
+    argmins = is_min[np.unique(bucket_of[is_min], return_index=True)[1]]
+    argmaxs = is_max[np.unique(bucket_of[is_max], return_index=True)[1]]
+    
+    candidates = np.unique(np.concatenate(([0], argmins + 1, argmaxs + 1, [n - 1])))
+    return candidates[lttb_indices(x[candidates], y[candidates], n_out)]
+
+
+def minmax_aggregate(x: np.ndarray, y: np.ndarray,
+                     n_buckets: int = 1000) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduce a series to per-bucket min, max and mean over equal-count buckets.
+    
+    Args:
+        x: Monotonically increasing x values
+        y: Values to aggregate
+        n_buckets: Number of buckets (capped at len(y))
+        
+    Returns:
+        Tuple of (bucket start x, mins, maxs, means)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n_buckets = max(1, min(n_buckets, len(y)))
+    starts = np.linspace(0, len(y), n_buckets + 1).astype(np.int64)[:-1]
+    
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+    means = np.add.reduceat(y, starts) / np.diff(np.append(starts, len(y)))
+    return np.asarray(x)[starts], mins, maxs, means
+
+
 def interpret_rsi(rsi: float) -> str:
     """
     Interpret RSI value.
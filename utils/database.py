@@ -5,11 +5,17 @@ Provides SQLite-based historical price data management with data validation.
 
 import sqlite3
 import logging
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+import queue
+import threading
+import time
+from typing import List, Dict, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
 from contextlib import contextmanager
+from itertools import repeat
 import os
 
+import numpy as np
+
 from config.settings import settings
 from utils.exceptions import DatabaseError
 from utils.pyth_client import pyth_client
@@ -18,65 +24,243 @@ from utils.pyth_client import pyth_client
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MS_PER_HOUR = 3_600_000
+_MS_PER_DAY = 86_400_000
+
+# Timestamps are stored as INTEGER Unix epoch milliseconds (UTC) and returned as ISO 8601 strings
+_ISO = "strftime('%Y-%m-%dT%H:%M:%f+00:00', {} / 1000.0, 'unixepoch')"
+
+_SQL_CREATE_PRICE_HISTORY = '''
+    CREATE TABLE IF NOT EXISTS price_history (
+        id INTEGER PRIMARY KEY,
+        coin_id TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        price REAL NOT NULL,
+        volume_24h REAL,
+        market_cap REAL,
+        source TEXT DEFAULT 'pyth',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Statements shared by every call (and connection), so each is prepared once per connection
+_SQL_INSERT = '''
+    INSERT OR IGNORE INTO price_history (coin_id, timestamp, price, volume_24h, market_cap, source)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_HISTORY = '''
+    SELECT {ts} AS timestamp, price, volume_24h, market_cap, source
+    FROM price_history
+    WHERE coin_id = ? AND price_history.timestamp >= ?
+    ORDER BY price_history.timestamp ASC
+'''.format(ts=_ISO.format('price_history.timestamp'))
+
+_SQL_LATEST = '''
+    SELECT {ts} AS timestamp, price, volume_24h, market_cap, source
+    FROM price_history
+    WHERE coin_id = ?
+    ORDER BY price_history.timestamp DESC
+    LIMIT 1
+'''.format(ts=_ISO.format('price_history.timestamp'))
+
+_SQL_RANGE = '''
+    SELECT {ts} AS timestamp, price, volume_24h, market_cap, source
+    FROM price_history
+    WHERE coin_id = ? AND price_history.timestamp >= ? AND price_history.timestamp <= ?
+    ORDER BY price_history.timestamp ASC
+'''.format(ts=_ISO.format('price_history.timestamp'))
+
+_SQL_COIN_STATS = '''
+    SELECT coin_id, COUNT(*) as count, {oldest} as oldest, {newest} as newest
+    FROM price_history
+    GROUP BY coin_id
+    ORDER BY count DESC
+'''.format(oldest=_ISO.format('MIN(timestamp)'), newest=_ISO.format('MAX(timestamp)'))
+
+
+def _to_epoch_ms(value: datetime) -> int:
+    """Convert a datetime (naive values are taken as UTC) to Unix epoch milliseconds."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return round((value - _EPOCH) / timedelta(milliseconds=1))
+
+
+def _from_epoch_ms(value: int) -> str:
+    """Format Unix epoch milliseconds the way the queries return timestamps (see _ISO)."""
+    return datetime.fromtimestamp(value / 1000, timezone.utc).isoformat(timespec='milliseconds')
+
+
+def _parse_timestamp(timestamp_str: Union[str, datetime]) -> datetime:
+    """Parse an ISO 8601 timestamp (datetimes pass through unparsed), assuming UTC when it has no offset."""
+    if isinstance(timestamp_str, datetime):
+        return timestamp_str if timestamp_str.tzinfo is not None else timestamp_str.replace(tzinfo=timezone.utc)
+
+    # Handle different timestamp formats
+    if timestamp_str.endswith('Z'):
+        timestamp_str = timestamp_str[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(timestamp_str)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _fetch_dicts(conn: sqlite3.Connection, sql: str, params: Tuple) -> List[Dict]:
+    """Run a SELECT and return its rows as dicts keyed by the selected column names."""
+    # Plain tuples skip building a sqlite3.Row per row; the column names are read once
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
 
 class DatabaseManager:
     """SQLite database manager for cryptocurrency price data."""
 
+    # Read-only queries share this many pooled connections; writes go through one
+    READ_POOL_SIZE = 4
+    # Seconds a cached latest price is trusted (other processes may write the same file)
+    LATEST_TTL = 60
+
     def __init__(self, db_path: str = "crypto_prices.db"):
         """
-        Initialize database connection.
+        Initialize database connections.
 
         Args:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        # WAL allows one writer alongside any number of readers
+        self._write_lock = threading.Lock()
+        self._write_conn = self._open_connection()
         self._init_db()
-
-    @contextmanager
-    def get_connection(self):
-        """Context manager for database connections."""
-        conn = None
+        # coin_id -> (expires_at, latest row) so get_latest_price can skip the query
+        self._latest: Dict[str, Tuple[float, Dict]] = {}
+        # coin_id -> write count, so a read that raced a write doesn't cache what it saw
+        self._latest_writes: Dict[str, int] = {}
+        self._latest_lock = threading.Lock()
+        # Readers open after the schema (and planner statistics) are in place
+        self._read_pool = queue.Queue(maxsize=self.READ_POOL_SIZE)
+        for _ in range(self.READ_POOL_SIZE):
+            self._read_pool.put(self._open_connection())
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection pragmas applied."""
         try:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=200)
             conn.execute("PRAGMA foreign_keys = ON")
+            # Per-connection tuning (WAL itself is persisted by _init_db): one fsync per
+            # checkpoint instead of per commit, in-memory temp tables, larger page cache
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -64000")
+            conn.execute("PRAGMA mmap_size = 268435456")
+            conn.execute("PRAGMA busy_timeout = 5000")
             conn.row_factory = sqlite3.Row  # Enable column access by name
-            yield conn
+            return conn
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}")
             raise DatabaseError(f"Failed to connect to database: {str(e)}")
+
+    @contextmanager
+    def get_writer(self):
+        """Context manager for the shared write connection (one writer at a time)."""
+        with self._write_lock:
+            conn = self._write_conn
+            try:
+                yield conn
+            except sqlite3.Error as e:
+                logger.error(f"Database write error: {e}")
+                raise DatabaseError(f"Database write failed: {str(e)}")
+            finally:
+                # Never leave a half-finished transaction on the shared connection
+                if conn.in_transaction:
+                    conn.rollback()
+
+    @contextmanager
+    def get_reader(self):
+        """Context manager that checks a read connection out of the pool."""
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        except sqlite3.Error as e:
+            logger.error(f"Database read error: {e}")
+            raise DatabaseError(f"Database read failed: {str(e)}")
         finally:
-            if conn:
-                conn.close()
+            self._read_pool.put(conn)
+
+    # Read-write access for callers of the original API
+    get_connection = get_writer
+
+    def close(self):
+        """Close the write connection and every pooled read connection."""
+        with self._write_lock:
+            self._write_conn.close()
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
 
     def _init_db(self):
         """Initialize database schema."""
         try:
-            with self.get_connection() as conn:
-                # Create price_history table
-                conn.execute('''
-                    CREATE TABLE IF NOT EXISTS price_history (
-                        id INTEGER PRIMARY KEY,
-                        coin_id TEXT NOT NULL,
-                        timestamp DATETIME NOT NULL,
-                        price REAL NOT NULL,
-                        volume_24h REAL,
-                        market_cap REAL,
-                        source TEXT DEFAULT 'pyth',
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+            with self.get_writer() as conn:
+                # Write-ahead logging lets readers run alongside the writer (persisted in the file)
+                conn.execute("PRAGMA journal_mode = WAL")
 
-                # Create indexes for performance
-                conn.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_coin_timestamp
-                    ON price_history(coin_id, timestamp)
-                ''')
+                # Create price_history table
+                conn.execute(_SQL_CREATE_PRICE_HISTORY)
+
+                # Databases created before epoch storage hold ISO text timestamps
+                timestamp_type = next(
+                    row['type'] for row in conn.execute("PRAGMA table_info(price_history)")
+                    if row['name'] == 'timestamp'
+                )
+                if timestamp_type.upper() != 'INTEGER':
+                    self._migrate_to_epoch_timestamps(conn)
+
+                # Create indexes for performance. The per-coin reads select exactly these
+                # columns, so they are answered from the index without touching the table
+                has_covering_index = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_coin_ts_cover'"
+                ).fetchone()
+                if not has_covering_index:
+                    conn.execute('''
+                        CREATE INDEX idx_coin_ts_cover
+                        ON price_history(coin_id, timestamp, price, volume_24h, market_cap, source)
+                    ''')
+                    # Superseded by the covering index
+                    conn.execute("DROP INDEX IF EXISTS idx_coin_timestamp")
+                    # Give the planner statistics so existing data picks the covering index
+                    # over the unique (coin_id, timestamp) one
+                    analyze = True
+                else:
+                    analyze = False
+
+                # One row per coin and timestamp, enforced by the insert itself
+                has_unique_index = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_coin_ts'"
+                ).fetchone()
+                if not has_unique_index:
+                    # Databases created before the constraint may hold exact duplicates; keep the first
+                    conn.execute('''
+                        DELETE FROM price_history
+                        WHERE id NOT IN (SELECT MIN(id) FROM price_history GROUP BY coin_id, timestamp)
+                    ''')
+                    conn.execute('''
+                        CREATE UNIQUE INDEX ux_coin_ts
+                        ON price_history(coin_id, timestamp)
+                    ''')
 
                 conn.execute('''
                     CREATE INDEX IF NOT EXISTS idx_timestamp
                     ON price_history(timestamp)
                 ''')
 
+                if analyze:
+                    conn.execute("ANALYZE price_history")
+
                 conn.commit()
                 logger.info("Database initialized successfully")
 
@@ -84,102 +268,128 @@ class DatabaseManager:
             logger.error(f"Failed to initialize database: {e}")
             raise DatabaseError(f"Database initialization failed: {str(e)}")
 
+    def _migrate_to_epoch_timestamps(self, conn: sqlite3.Connection):
+        """Rebuild price_history with INTEGER epoch-millisecond timestamps (text ones are converted)."""
+        logger.info("Migrating price_history timestamps to epoch milliseconds")
+        # Older versions stored offset-less datetime.now() strings, i.e. server local time; the
+        # 'utc' modifier converts those (using this server's zone), values with an offset are exact
+        julian = (
+            "CASE WHEN timestamp LIKE '%Z' OR timestamp GLOB '*[+-][0-9][0-9]:[0-9][0-9]' "
+            "THEN julianday(timestamp) ELSE julianday(timestamp, 'utc') END"
+        )
+        # SQLite DDL is transactional, so a failure at any step leaves the old table untouched
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("ALTER TABLE price_history RENAME TO price_history_text")
+            conn.execute(_SQL_CREATE_PRICE_HISTORY)
+
+            # Rows whose timestamp can't be read are set aside rather than dropped
+            invalid_count = conn.execute(
+                f"SELECT COUNT(*) FROM price_history_text WHERE ({julian}) IS NULL"
+            ).fetchone()[0]
+            if invalid_count:
+                logger.warning(
+                    "%d price_history rows have unparseable timestamps; kept in price_history_invalid",
+                    invalid_count
+                )
+                conn.execute("CREATE TABLE IF NOT EXISTS price_history_invalid AS SELECT * FROM price_history_text WHERE 0")
+                conn.execute(
+                    f"INSERT INTO price_history_invalid SELECT * FROM price_history_text WHERE ({julian}) IS NULL"
+                )
+
+            conn.execute(f'''
+                INSERT INTO price_history (id, coin_id, timestamp, price, volume_24h, market_cap, source, created_at)
+                SELECT id, coin_id, CAST(ROUND(({julian} - 2440587.5) * 86400000) AS INTEGER),
+                       price, volume_24h, market_cap, source, created_at
+                FROM price_history_text
+                WHERE ({julian}) IS NOT NULL
+            ''')
+            # Also drops the old table's indexes, which _init_db recreates
+            conn.execute("DROP TABLE price_history_text")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
     def insert_price_data(self, coin_id: str, price_data: Dict) -> bool:
         """
         Insert price data into database with validation.
 
         Args:
             coin_id: Cryptocurrency identifier
-            price_data: Dictionary containing price information
+            price_data: Dictionary containing price information ('timestamp' may be
+                a datetime, which skips ISO parsing, or an ISO 8601 string)
 
         Returns:
             True if inserted successfully, False otherwise
         """
         try:
             # Validate data
-            if not self._validate_price_data(price_data):
-                logger.warning(f"Invalid price data for {coin_id}: {price_data}")
+            parsed_timestamp = self._validate_price_data(price_data)
+            if parsed_timestamp is None:
+                logger.warning("Invalid price data for %s: %s", coin_id, price_data)
                 return False
 
-            with self.get_connection() as conn:
-                # Check for duplicate entry (same coin_id and timestamp within 1 minute)
-                existing = conn.execute('''
-                    SELECT id FROM price_history
-                    WHERE coin_id = ? AND timestamp >= ? AND timestamp < ?
-                ''', (
-                    coin_id,
-                    price_data['timestamp'],
-                    (datetime.fromisoformat(price_data['timestamp']) + timedelta(minutes=1)).isoformat()
-                )).fetchone()
-
-                if existing:
-                    logger.debug(f"Duplicate price data for {coin_id} at {price_data['timestamp']}, skipping")
-                    return False
-
-                # Insert new price data
-                conn.execute('''
-                    INSERT INTO price_history (coin_id, timestamp, price, volume_24h, market_cap, source)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
+            with self.get_writer() as conn:
+                # Insert new price data; an existing row for the same coin and timestamp wins
+                epoch_ms = _to_epoch_ms(parsed_timestamp)
+                cursor = conn.execute(_SQL_INSERT, (
                     coin_id,
-                    price_data['timestamp'],
+                    epoch_ms,
                     price_data['price'],
                     price_data.get('volume_24h'),
                     price_data.get('market_cap'),
                     price_data.get('source', 'pyth')
                 ))
 
+                if cursor.rowcount == 0:
+                    logger.debug("Duplicate price data for %s at %s, skipping", coin_id, price_data['timestamp'])
+                    return False
+
                 conn.commit()
-                logger.debug(f"Inserted price data for {coin_id}: ${price_data['price']}")
-                return True
+                logger.debug("Inserted price data for %s: $%s", coin_id, price_data['price'])
+
+            self._advance_latest(coin_id, epoch_ms, price_data)
+            return True
 
         except Exception as e:
             logger.error(f"Failed to insert price data for {coin_id}: {e}")
             return False
 
-    def _validate_price_data(self, price_data: Dict) -> bool:
+    def _validate_price_data(self, price_data: Dict) -> Optional[datetime]:
         """
         Validate price data before insertion.
 
         Args:
-            price_data: Price data dictionary
+            price_data: Price data dictionary (datetime or ISO 8601 'timestamp')
 
         Returns:
-            True if valid, False otherwise
+            The parsed timestamp if valid (so callers needn't parse it again), None otherwise
         """
-        required_fields = ['timestamp', 'price']
+        timestamp = price_data.get('timestamp')
+        raw_price = price_data.get('price')
 
         # Check required fields
-        for field in required_fields:
-            if field not in price_data:
-                logger.warning(f"Missing required field: {field}")
-                return False
+        if timestamp is None or raw_price is None:
+            logger.warning("Missing required field: %s", 'timestamp' if timestamp is None else 'price')
+            return None
 
         # Validate price
         try:
-            price = float(price_data['price'])
-            if price <= 0:
-                logger.warning(f"Invalid price: {price} (must be > 0)")
-                return False
+            price = float(raw_price)
         except (ValueError, TypeError):
-            logger.warning(f"Invalid price format: {price_data['price']}")
-            return False
+            logger.warning("Invalid price format: %s", raw_price)
+            return None
+        if price <= 0:
+            logger.warning("Invalid price: %s (must be > 0)", price)
+            return None
 
         # Validate timestamp
         try:
-            timestamp_str = price_data['timestamp']
-            # Handle different timestamp formats
-            if timestamp_str.endswith('Z'):
-                timestamp_str = timestamp_str[:-1] + '+00:00'
-            elif '+' not in timestamp_str and timestamp_str.count('-') == 2:
-                # ISO format without timezone, assume UTC
-                timestamp_str += '+00:00'
-            datetime.fromisoformat(timestamp_str)
-        except (ValueError, AttributeError):
-            logger.warning(f"Invalid timestamp format: {price_data['timestamp']}")
-            return False
-
-        return True
+            return _parse_timestamp(timestamp)
+        except (ValueError, AttributeError, TypeError):
+            logger.warning("Invalid timestamp format: %s", timestamp)
+            return None
 
     def get_historical_prices(self, coin_id: str, days: int = 30) -> List[Dict]:
         """
@@ -193,23 +403,10 @@ class DatabaseManager:
             List of price data dictionaries
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-
-            with self.get_connection() as conn:
-                rows = conn.execute('''
-                    SELECT timestamp, price, volume_24h, market_cap, source
-                    FROM price_history
-                    WHERE coin_id = ? AND timestamp >= ?
-                    ORDER BY timestamp ASC
-                ''', (coin_id, cutoff_date.isoformat())).fetchall()
-
-                return [{
-                    'timestamp': row['timestamp'],
-                    'price': row['price'],
-                    'volume_24h': row['volume_24h'],
-                    'market_cap': row['market_cap'],
-                    'source': row['source']
-                } for row in rows]
+            cutoff_ms = _to_epoch_ms(datetime.now(timezone.utc)) - days * _MS_PER_DAY
+
+            with self.get_reader() as conn:
+                return _fetch_dicts(conn, _SQL_HISTORY, (coin_id, cutoff_ms))
 
         except Exception as e:
             logger.error(f"Failed to get historical prices for {coin_id}: {e}")
@@ -225,58 +422,78 @@ class DatabaseManager:
         Returns:
             Latest price data dictionary or None if not found
         """
+        with self._latest_lock:
+            cached = self._latest.get(coin_id)
+            writes = self._latest_writes.get(coin_id, 0)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
         try:
-            with self.get_connection() as conn:
-                row = conn.execute('''
-                    SELECT timestamp, price, volume_24h, market_cap, source
-                    FROM price_history
-                    WHERE coin_id = ?
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                ''', (coin_id,)).fetchone()
-
-                if row:
-                    return {
-                        'timestamp': row['timestamp'],
-                        'price': row['price'],
-                        'volume_24h': row['volume_24h'],
-                        'market_cap': row['market_cap'],
-                        'source': row['source']
-                    }
+            with self.get_reader() as conn:
+                row = conn.execute(_SQL_LATEST, (coin_id,)).fetchone()
+
+            if row is None:
                 return None
+            latest = dict(row)
+            with self._latest_lock:
+                # A write since the snapshot may have superseded this row; leave it to the next read
+                if self._latest_writes.get(coin_id, 0) == writes:
+                    self._latest[coin_id] = (time.monotonic() + self.LATEST_TTL, latest)
+            return dict(latest)
 
         except Exception as e:
             logger.error(f"Failed to get latest price for {coin_id}: {e}")
             return None
 
-    def get_price_range(self, coin_id: str, start_date: str, end_date: str) -> List[Dict]:
+    def _advance_latest(self, coin_id: str, epoch_ms: int, price_data: Dict):
+        """Move a coin's cached latest row forward to a newly inserted row, if it is newer."""
+        with self._latest_lock:
+            self._latest_writes[coin_id] = self._latest_writes.get(coin_id, 0) + 1
+            cached = self._latest.get(coin_id)
+            if cached is None:
+                # The insert alone can't tell whether it is the latest row; the next read fills the cache
+                return
+            if cached[0] <= time.monotonic():
+                del self._latest[coin_id]
+                return
+
+            timestamp = _from_epoch_ms(epoch_ms)
+            # Timestamps are fixed-width UTC ISO strings, so string order is time order
+            if timestamp >= cached[1]['timestamp']:
+                self._latest[coin_id] = (time.monotonic() + self.LATEST_TTL, {
+                    'timestamp': timestamp,
+                    'price': float(price_data['price']),
+                    'volume_24h': price_data.get('volume_24h'),
+                    'market_cap': price_data.get('market_cap'),
+                    'source': price_data.get('source', 'pyth')
+                })
+
+    def _forget_latest(self, coin_id: str):
+        """Drop a coin's cached latest row after a bulk write."""
+        with self._latest_lock:
+            self._latest_writes[coin_id] = self._latest_writes.get(coin_id, 0) + 1
+            self._latest.pop(coin_id, None)
+
+    def get_price_range(self, coin_id: str, start_date: Union[str, datetime],
+                        end_date: Union[str, datetime]) -> List[Dict]:
         """
         Get price data within a date range.
 
         Args:
             coin_id: Cryptocurrency identifier
-            start_date: Start date in ISO format
-            end_date: End date in ISO format
+            start_date: Start date as a datetime or in ISO format
+            end_date: End date as a datetime or in ISO format
 
         Returns:
             List of price data dictionaries
         """
         try:
-            with self.get_connection() as conn:
-                rows = conn.execute('''
-                    SELECT timestamp, price, volume_24h, market_cap, source
-                    FROM price_history
-                    WHERE coin_id = ? AND timestamp >= ? AND timestamp <= ?
-                    ORDER BY timestamp ASC
-                ''', (coin_id, start_date, end_date)).fetchall()
-
-                return [{
-                    'timestamp': row['timestamp'],
-                    'price': row['price'],
-                    'volume_24h': row['volume_24h'],
-                    'market_cap': row['market_cap'],
-                    'source': row['source']
-                } for row in rows]
+            with self.get_reader() as conn:
+                return _fetch_dicts(conn, _SQL_RANGE, (
+                    coin_id,
+                    _to_epoch_ms(_parse_timestamp(start_date)),
+                    _to_epoch_ms(_parse_timestamp(end_date))
+                ))
 
         except Exception as e:
             logger.error(f"Failed to get price range for {coin_id}: {e}")
@@ -297,51 +514,36 @@ class DatabaseManager:
             Dictionary mapping coin_ids to number of records inserted
         """
         results = {}
-        end_date = datetime.now()
+        end_ms = _to_epoch_ms(datetime.now(timezone.utc))
 
         logger.info(f"Starting backfill for {len(coin_ids)} coins over {days} days")
 
         try:
-            for coin_id in coin_ids:
-                inserted_count = 0
+            # Get current prices to use as base (one request for all coins)
+            current_data = pyth_client.get_current_prices(coin_ids)
 
-                # Get current price to use as base
-                current_data = pyth_client.get_current_prices([coin_id])
-                if coin_id not in current_data:
-                    logger.warning(f"Could not fetch current price for {coin_id}, skipping backfill")
+            # Generate historical timestamps (every 4 hours for efficiency)
+            timestamps = np.arange(end_ms - days * _MS_PER_DAY, end_ms + 1, 4 * _MS_PER_HOUR).tolist()
+
+            for coin_id in coin_ids:
+                coin_data = current_data.get(coin_id)
+                if coin_data is None:
+                    logger.warning("Could not fetch current price for %s, skipping backfill", coin_id)
                     results[coin_id] = 0
                     continue
 
-                current_price = current_data[coin_id]['current_price']
-
-                # Generate historical timestamps (every 4 hours for efficiency)
-                timestamps = []
-                current_time = end_date - timedelta(days=days)
-
-                while current_time <= end_date:
-                    timestamps.append(current_time)
-                    current_time += timedelta(hours=4)
-
-                # Insert historical data with simulated prices
-                for timestamp in timestamps:
-                    # Add some realistic volatility (±5%)
-                    import random
-                    volatility_factor = random.uniform(0.95, 1.05)
-                    simulated_price = current_price * volatility_factor
-
-                    price_data = {
-                        'timestamp': timestamp.isoformat(),
-                        'price': simulated_price,
-                        'volume_24h': current_data[coin_id].get('total_volume', simulated_price * 1000000),
-                        'market_cap': current_data[coin_id].get('market_cap', simulated_price * 10000000),
-                        'source': 'pyth_simulated'
-                    }
+                rows = self._prepare_backfill_rows(coin_id, coin_data, timestamps)
 
-                    if self.insert_price_data(coin_id, price_data):
-                        inserted_count += 1
+                # One transaction per coin, skipping timestamps already stored
+                with self.get_writer() as conn:
+                    changes_before = conn.total_changes
+                    conn.executemany(_SQL_INSERT, rows)
+                    conn.commit()
+                    inserted_count = conn.total_changes - changes_before
 
                 results[coin_id] = inserted_count
-                logger.info(f"Backfilled {inserted_count} records for {coin_id}")
+                self._forget_latest(coin_id)
+                logger.info("Backfilled %d records for %s", inserted_count, coin_id)
 
         except Exception as e:
             logger.error(f"Failed to backfill historical data: {e}")
@@ -349,6 +551,35 @@ class DatabaseManager:
 
         return results
 
+    @staticmethod
+    def _prepare_backfill_rows(coin_id: str, coin_data: Dict, timestamps: List[int]) -> List[Tuple]:
+        """
+        Build simulated price_history rows for one coin around its current price.
+
+        Args:
+            coin_id: Cryptocurrency identifier
+            coin_data: Current price data for the coin
+            timestamps: Epoch-millisecond timestamps to generate rows for
+
+        Returns:
+            List of insert parameter tuples
+        """
+        # Add some realistic volatility (±5%) to simulate historical prices
+        n = len(timestamps)
+        prices = coin_data['current_price'] * np.random.uniform(0.95, 1.05, n)
+        volumes = (repeat(coin_data['total_volume'], n) if 'total_volume' in coin_data
+                   else (prices * 1000000).tolist())
+        market_caps = (repeat(coin_data['market_cap'], n) if 'market_cap' in coin_data
+                       else (prices * 10000000).tolist())
+        return list(zip(
+            repeat(coin_id),
+            timestamps,
+            prices.tolist(),
+            volumes,
+            market_caps,
+            repeat('pyth_simulated')
+        ))
+
     def ingest_current_prices(self, coin_ids: List[str]) -> Dict[str, bool]:
         """
         Fetch current prices from Pyth and store in database.
@@ -382,11 +613,11 @@ class DatabaseManager:
                     results[coin_id] = success
 
                     if success:
-                        logger.info(f"Successfully ingested price for {coin_id}: ${data['current_price']}")
+                        logger.info("Successfully ingested price for %s: $%s", coin_id, data['current_price'])
                     else:
-                        logger.warning(f"Failed to ingest price for {coin_id}")
+                        logger.warning("Failed to ingest price for %s", coin_id)
                 else:
-                    logger.warning(f"No price data available for {coin_id}")
+                    logger.warning("No price data available for %s", coin_id)
                     results[coin_id] = False
 
         except Exception as e:
@@ -403,26 +634,13 @@ class DatabaseManager:
             Dictionary with database statistics
         """
         try:
-            with self.get_connection() as conn:
-                # Total records
-                total_records = conn.execute('SELECT COUNT(*) FROM price_history').fetchone()[0]
-
-                # Records per coin
-                coin_stats = conn.execute('''
-                    SELECT coin_id, COUNT(*) as count, MIN(timestamp) as oldest, MAX(timestamp) as newest
-                    FROM price_history
-                    GROUP BY coin_id
-                    ORDER BY count DESC
-                ''').fetchall()
-
-                # Date range
-                date_range = conn.execute('''
-                    SELECT MIN(timestamp) as oldest, MAX(timestamp) as newest
-                    FROM price_history
-                ''').fetchone()
+            with self.get_reader() as conn:
+                # Records per coin (one index scan; the overall figures are derived from it)
+                coin_stats = conn.execute(_SQL_COIN_STATS).fetchall()
 
+                # Fixed-width UTC ISO strings, so string order is time order
                 return {
-                    'total_records': total_records,
+                    'total_records': sum(row['count'] for row in coin_stats),
                     'coins_tracked': len(coin_stats),
                     'coin_breakdown': [{
                         'coin_id': row['coin_id'],
@@ -433,8 +651,8 @@ class DatabaseManager:
                         }
                     } for row in coin_stats],
                     'overall_date_range': {
-                        'oldest': date_range['oldest'],
-                        'newest': date_range['newest']
+                        'oldest': min((row['oldest'] for row in coin_stats), default=None),
+                        'newest': max((row['newest'] for row in coin_stats), default=None)
                     }
                 }
 
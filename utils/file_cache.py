@@ -0,0 +1,148 @@
+"""
+Disk-backed cache for API responses.
+Persists JSON payloads and NumPy arrays under the cache directory so they survive process restarts.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+from config.settings import settings
+
+# Configure logging
+logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
+logger = logging.getLogger(__name__)
+
+
+class FileCache:
+    """JSON file cache with per-entry TTL."""
+    
+    def __init__(self, cache_dir: Path = settings.CACHE_DIR):
+        """
+        Initialize the file cache.
+        
+        Args:
+            cache_dir: Root directory for cache files
+        """
+        self.cache_dir = Path(cache_dir)
+    
+    def _path(self, namespace: str, endpoint: str, params: Optional[Dict] = None) -> Path:
+        """Build the cache file path for a namespace/endpoint/params combination."""
+        key = json.dumps(params or {}, sort_keys=True, default=str)
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / namespace / f"{endpoint}_{digest}.json"
+    
+    def get(self, namespace: str, endpoint: str, params: Optional[Dict] = None,
+            ttl: int = 300) -> Optional[Any]:
+        """
+        Get a cached payload if it exists and has not expired.
+        
+        Args:
+            namespace: Cache namespace (e.g. data provider)
+            endpoint: Endpoint or function name
+            params: Parameters the payload was fetched with
+            ttl: Maximum age in seconds
+            
+        Returns:
+            Cached payload or None if missing/expired
+        """
+        path = self._path(namespace, endpoint, params)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read cache file {path}: {e}")
+            return None
+        
+        if time.time() - entry.get('timestamp', 0) > ttl:
+            return None
+        
+        logger.debug(f"File cache hit for {path}")
+        return entry.get('data')
+    
+    def set(self, namespace: str, endpoint: str, data: Any, params: Optional[Dict] = None):
+        """
+        Store a payload on disk.
+        
+        Args:
+            namespace: Cache namespace (e.g. data provider)
+            endpoint: Endpoint or function name
+            data: JSON-serializable payload
+            params: Parameters the payload was fetched with
+        """
+        path = self._path(namespace, endpoint, params)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'timestamp': time.time(), 'data': data}, f, default=str)
+            tmp_path.replace(path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write cache file {path}: {e}")
+    
+    def get_arrays(self, namespace: str, name: str,
+                   ttl: Optional[int] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get cached arrays stored with ``set_arrays``.
+        
+        Args:
+            namespace: Cache namespace (e.g. "hist")
+            name: Entry name, used as the file name
+            ttl: Maximum age in seconds (by file modification time); None never expires
+            
+        Returns:
+            Dictionary of arrays or None if missing/expired/unreadable
+        """
+        path = self.cache_dir / namespace / f"{name}.npz"
+        try:
+            if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+                return None
+            with np.load(path, allow_pickle=False) as npz:
+                return {key: npz[key] for key in npz.files}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read cache file {path}: {e}")
+            return None
+    
+    def set_arrays(self, namespace: str, name: str, replaces: Optional[str] = None,
+                   **arrays: np.ndarray):
+        """
+        Store arrays on disk as a compressed ``.npz`` file.
+        
+        Args:
+            namespace: Cache namespace (e.g. "hist")
+            name: Entry name, used as the file name
+            replaces: Name prefix of earlier entries this one supersedes (e.g. previous
+                days' files); they are deleted once the new entry is written
+            **arrays: Arrays to store, keyed by name
+        """
+        path = self.cache_dir / namespace / f"{name}.npz"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            tmp_path.replace(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to write cache file {path}: {e}")
+            return
+        
+        if replaces is not None:
+            for old_path in path.parent.glob(f"{replaces}*.npz"):
+                if old_path != path:
+                    try:
+                        old_path.unlink()
+                    except OSError as e:
+                        logger.warning(f"Failed to remove cache file {old_path}: {e}")
+
+
+# Create singleton instance
+file_cache = FileCache()
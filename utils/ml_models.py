@@ -121,16 +121,13 @@ class LSTMPredictor:
             self.scaler = MinMaxScaler(feature_range=(0, 1))
             scaled_prices = self.scaler.fit_transform(prices)
 
-            # Create sequences
-            X, y = [], []
-            for i in range(self.sequence_length, len(scaled_prices)):
-                X.append(scaled_prices[i-self.sequence_length:i, 0])
-                y.append(scaled_prices[i, 0])
-
-            X, y = np.array(X), np.array(y)
+            # Create sequences: row i is the window ending just before y[i] (a view, no copies)
+            windows = np.lib.stride_tricks.sliding_window_view(scaled_prices[:, 0], self.sequence_length)
+            X = windows[:-1]
+            y = scaled_prices[self.sequence_length:, 0]
 
             # Reshape X for LSTM input
-            X = X.reshape((X.shape[0], X.shape[1], 1))
+            X = X[..., np.newaxis]
 
             # Split into train/test
             split_idx = int(len(X) * (1 - self.hyperparams['validation_split']))
@@ -53,6 +53,14 @@ class ModelMonitor:
                 )
             ''')
 
+            # Covering index for the "latest evaluated predictions" lookups
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_predictions_lookup
+                ON predictions(model_version, coin_id, prediction_timestamp DESC,
+                               predicted_price, actual_price)
+                WHERE actual_price IS NOT NULL
+            ''')
+
             conn.commit()
 
     def store_prediction(self, model_version: str, coin_id: str,
@@ -97,8 +105,8 @@ class ModelMonitor:
                     # Get actual price from main database (within ±1 hour of prediction date)
                     actual_data = db_manager.get_price_range(
                         coin_id,
-                        (pred_date - timedelta(hours=1)).isoformat(),
-                        (pred_date + timedelta(hours=1)).isoformat()
+                        pred_date - timedelta(hours=1),
+                        pred_date + timedelta(hours=1)
                     )
 
                     if actual_data:
@@ -218,38 +226,44 @@ class ModelMonitor:
                                       threshold_mape: float = 15.0) -> Dict:
         """Detect if model performance has degraded"""
         try:
-            # Get recent metrics (last 7 days)
+            # Get recent metrics (last 7 days) and baseline performance (last 30 days)
             recent_metrics = self.calculate_metrics(model_version, coin_id, days=7)
-
             if recent_metrics.get('sample_size', 0) < 5:
                 return {'degraded': False, 'reason': 'Insufficient data'}
 
-            recent_mape = recent_metrics.get('mape', 0)
-
-            # Get baseline performance (last 30 days)
             baseline_metrics = self.calculate_metrics(model_version, coin_id, days=30)
-            baseline_mape = baseline_metrics.get('mape', 0)
+            return self._assess_degradation(recent_metrics, baseline_metrics, threshold_mape)
 
-            if baseline_mape == 0:
-                return {'degraded': False, 'reason': 'No baseline available'}
+        except Exception as e:
+            logger.error(f"Failed to detect performance degradation: {e}")
+            return {'degraded': False, 'error': str(e)}
 
-            # Check for degradation
-            degradation_ratio = recent_mape / baseline_mape
+    @staticmethod
+    def _assess_degradation(recent_metrics: Dict, baseline_metrics: Dict,
+                            threshold_mape: float = 15.0) -> Dict:
+        """Compare recent metrics against the baseline window"""
+        if recent_metrics.get('sample_size', 0) < 5:
+            return {'degraded': False, 'reason': 'Insufficient data'}
 
-            degraded = recent_mape > threshold_mape or degradation_ratio > 1.5
+        recent_mape = recent_metrics.get('mape', 0)
+        baseline_mape = baseline_metrics.get('mape', 0)
 
-            return {
-                'degraded': degraded,
-                'recent_mape': recent_mape,
-                'baseline_mape': baseline_mape,
-                'degradation_ratio': degradation_ratio,
-                'threshold_exceeded': recent_mape > threshold_mape,
-                'relative_degradation': degradation_ratio > 1.5
-            }
+        if baseline_mape == 0:
+            return {'degraded': False, 'reason': 'No baseline available'}
 
-        except Exception as e:
-            logger.error(f"Failed to detect performance degradation: {e}")
-            return {'degraded': False, 'error': str(e)}
+        # Check for degradation
+        degradation_ratio = recent_mape / baseline_mape
+
+        degraded = recent_mape > threshold_mape or degradation_ratio > 1.5
+
+        return {
+            'degraded': degraded,
+            'recent_mape': recent_mape,
+            'baseline_mape': baseline_mape,
+            'degradation_ratio': degradation_ratio,
+            'threshold_exceeded': recent_mape > threshold_mape,
+            'relative_degradation': degradation_ratio > 1.5
+        }
 
     def get_rolling_accuracy(self, model_version: str, coin_id: str) -> Dict:
         """Get rolling accuracy metrics for different time periods"""
@@ -269,74 +283,191 @@ class ModelMonitor:
             # Get recent performance (last 7 days)
             recent_metrics = self.calculate_metrics(model_version, coin_id, days=7)
 
-            if recent_metrics.get('sample_size', 0) < 5:
-                return {
-                    'should_retrain': False,
-                    'reason': 'Insufficient recent data for retraining decision'
-                }
+            degradation = None
+            if (recent_metrics.get('sample_size', 0) >= 5
+                    and recent_metrics.get('mape', 0) <= mape_threshold):
+                degradation = self.detect_performance_degradation(model_version, coin_id)
 
-            recent_mape = recent_metrics.get('mape', 0)
-
-            # Check if MAPE exceeds threshold
-            if recent_mape > mape_threshold:
-                return {
-                    'should_retrain': True,
-                    'reason': f'MAPE ({recent_mape:.2f}%) exceeds threshold ({mape_threshold}%)',
-                    'current_mape': recent_mape,
-                    'threshold': mape_threshold
-                }
-
-            # Check for significant degradation
-            degradation = self.detect_performance_degradation(model_version, coin_id)
-            if degradation.get('degraded', False):
-                return {
-                    'should_retrain': True,
-                    'reason': 'Performance degradation detected',
-                    'degradation_info': degradation
-                }
+            return self._assess_retraining(recent_metrics, degradation, mape_threshold)
 
+        except Exception as e:
+            logger.error(f"Failed to check retraining need: {e}")
             return {
                 'should_retrain': False,
-                'reason': f'Model performing well (MAPE: {recent_mape:.2f}%)',
-                'current_mape': recent_mape
+                'reason': f'Error checking retraining: {str(e)}'
             }
 
-        except Exception as e:
-            logger.error(f"Failed to check retraining need: {e}")
+    @staticmethod
+    def _assess_retraining(recent_metrics: Dict, degradation: Optional[Dict],
+                           mape_threshold: float = 15.0) -> Dict:
+        """Decide on retraining from recent metrics and the degradation check"""
+        if recent_metrics.get('sample_size', 0) < 5:
             return {
                 'should_retrain': False,
-                'reason': f'Error checking retraining: {str(e)}'
+                'reason': 'Insufficient recent data for retraining decision'
+            }
+
+        recent_mape = recent_metrics.get('mape', 0)
+
+        # Check if MAPE exceeds threshold
+        if recent_mape > mape_threshold:
+            return {
+                'should_retrain': True,
+                'reason': f'MAPE ({recent_mape:.2f}%) exceeds threshold ({mape_threshold}%)',
+                'current_mape': recent_mape,
+                'threshold': mape_threshold
+            }
+
+        # Check for significant degradation
+        if degradation and degradation.get('degraded', False):
+            return {
+                'should_retrain': True,
+                'reason': 'Performance degradation detected',
+                'degradation_info': degradation
             }
 
+        return {
+            'should_retrain': False,
+            'reason': f'Model performing well (MAPE: {recent_mape:.2f}%)',
+            'current_mape': recent_mape
+        }
+
     def get_model_health_score(self, model_version: str, coin_id: str) -> float:
         """Calculate overall model health score (0-100)"""
         try:
             degradation = self.detect_performance_degradation(model_version, coin_id)
             rolling_metrics = self.get_rolling_accuracy(model_version, coin_id)
+            return self._score_health(degradation, rolling_metrics.get('7_day', {}))
 
-            # Base score
-            score = 100.0
-
-            # Penalize for degradation
-            if degradation.get('degraded', False):
-                score -= 30
+        except Exception as e:
+            logger.error(f"Failed to calculate health score: {e}")
+            return 0.0
 
-            # Penalize for high MAPE
-            recent_mape = rolling_metrics.get('7_day', {}).get('mape', 0)
-            if recent_mape > 20:
-                score -= 20
-            elif recent_mape > 10:
-                score -= 10
+    @staticmethod
+    def _score_health(degradation: Dict, recent_metrics: Dict) -> float:
+        """Score model health (0-100) from degradation and recent metrics"""
+        # Base score
+        score = 100.0
+
+        # Penalize for degradation
+        if degradation.get('degraded', False):
+            score -= 30
+
+        # Penalize for high MAPE
+        recent_mape = recent_metrics.get('mape', 0)
+        if recent_mape > 20:
+            score -= 20
+        elif recent_mape > 10:
+            score -= 10
+
+        # Penalize for low sample size
+        sample_size = recent_metrics.get('sample_size', 0)
+        if sample_size < 10:
+            score -= 15
+        elif sample_size < 5:
+            score -= 30
+
+        return max(0, min(100, score))
+
+    def get_all_health_metrics(self, models: List[Dict],
+                               mape_threshold: float = 15.0) -> Dict[Tuple[str, str], Dict]:
+        """
+        Get health score, degradation and retraining status for many models at once.
+
+        Aggregates the 7-day and 30-day windows for every model in a single
+        GROUP BY query instead of several queries per model.
+
+        Args:
+            models: Model registry entries (need 'version' and 'coin_id')
+            mape_threshold: MAPE (%) above which a model is flagged
+
+        Returns:
+            Dictionary mapping (version, coin_id) to a dict with keys
+            'score', 'degradation' and 'retrain'
+        """
+        keys = {(m['version'], m['coin_id']) for m in models}
+        if not keys:
+            return {}
 
-            # Penalize for low sample size
-            sample_size = rolling_metrics.get('7_day', {}).get('sample_size', 0)
-            if sample_size < 10:
-                score -= 15
-            elif sample_size < 5:
-                score -= 30
+        now = datetime.now()
+        cutoff_7 = (now - timedelta(days=7)).isoformat()
+        cutoff_30 = (now - timedelta(days=30)).isoformat()
+        versions = sorted({version for version, _ in keys})
+        placeholders = ','.join('?' * len(versions))
 
-            return max(0, min(100, score))
+        windows = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(f'''
+                    SELECT model_version, coin_id,
+                           COUNT(*),
+                           SUM((predicted_price - actual_price) * (predicted_price - actual_price)),
+                           SUM(ABS(predicted_price - actual_price)),
+                           SUM(ABS((actual_price - predicted_price) / actual_price)),
+                           SUM(prediction_timestamp >= ?),
+                           SUM(CASE WHEN prediction_timestamp >= ?
+                               THEN (predicted_price - actual_price) * (predicted_price - actual_price) END),
+                           SUM(CASE WHEN prediction_timestamp >= ?
+                               THEN ABS(predicted_price - actual_price) END),
+                           SUM(CASE WHEN prediction_timestamp >= ?
+                               THEN ABS((actual_price - predicted_price) / actual_price) END)
+                    FROM predictions
+                    WHERE model_version IN ({placeholders})
+                      AND prediction_timestamp >= ?
+                      AND actual_price IS NOT NULL
+                    GROUP BY model_version, coin_id
+                ''', (cutoff_7, cutoff_7, cutoff_7, cutoff_7, *versions, cutoff_30)).fetchall()
+
+                metric_date = now.date().isoformat()
+                stored = []
+                for version, coin_id, n_30, sq_30, abs_30, pct_30, n_7, sq_7, abs_7, pct_7 in rows:
+                    if (version, coin_id) not in keys:
+                        continue
+                    recent = self._aggregate_metrics(n_7, sq_7, abs_7, pct_7)
+                    baseline = self._aggregate_metrics(n_30, sq_30, abs_30, pct_30)
+                    windows[(version, coin_id)] = (recent, baseline)
+
+                    # Keep performance history in sync, as calculate_metrics does
+                    for days, metrics in ((7, recent), (30, baseline)):
+                        if metrics['sample_size']:
+                            stored.append((version, coin_id, metric_date, days, metrics['rmse'],
+                                           metrics['mae'], metrics['mape'], metrics['sample_size']))
+
+                conn.executemany('''
+                    INSERT OR REPLACE INTO performance_metrics
+                    (model_version, coin_id, metric_date, period_days, rmse, mae, mape, sample_size)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', stored)
+                conn.commit()
 
         except Exception as e:
-            logger.error(f"Failed to calculate health score: {e}")
-            return 0.0
+            logger.error(f"Failed to calculate batch health metrics: {e}")
+
+        empty = {'sample_size': 0}
+        results = {}
+        for key in keys:
+            recent, baseline = windows.get(key, (empty, empty))
+            degradation = self._assess_degradation(recent, baseline, mape_threshold)
+            results[key] = {
+                'score': self._score_health(degradation, recent),
+                'degradation': degradation,
+                'retrain': self._assess_retraining(recent, degradation, mape_threshold)
+            }
+
+        return results
+
+    @staticmethod
+    def _aggregate_metrics(count: Optional[int], sum_sq: Optional[float],
+                           sum_abs: Optional[float], sum_pct: Optional[float]) -> Dict:
+        """Turn summed errors for a window into the metrics dict calculate_metrics returns"""
+        if not count:
+            return {'sample_size': 0}
+
+        mse = sum_sq / count
+        return {
+            'rmse': float(np.sqrt(mse)),
+            'mae': sum_abs / count,
+            'mape': sum_pct / count * 100,
+            'sample_size': count,
+            'mse': mse
+        }
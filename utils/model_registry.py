@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import List, Dict
 import os
 
+import pandas as pd
+
 class ModelRegistry:
     def __init__(self, db_path="models/models.db"):
         """Initialize model registry with SQLite database"""
@@ -94,6 +96,21 @@ class ModelRegistry:
             columns = [desc[0] for desc in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
+    def get_model_versions_df(self, coin_id=None) -> pd.DataFrame:
+        """Get all model versions as a DataFrame (one column per field), optionally filtered by coin_id"""
+        with sqlite3.connect(self.db_path) as conn:
+            if coin_id:
+                return pd.read_sql_query('''
+                    SELECT * FROM model_registry
+                    WHERE coin_id = ?
+                    ORDER BY created_at DESC
+                ''', conn, params=(coin_id,), parse_dates=['created_at'])
+
+            return pd.read_sql_query('''
+                SELECT * FROM model_registry
+                ORDER BY created_at DESC
+            ''', conn, parse_dates=['created_at'])
+
     def get_latest_version(self, coin_id):
         """Get the latest model version for a coin"""
         with sqlite3.connect(self.db_path) as conn:
@@ -4,8 +4,10 @@ Uses Hermes API for fast, reliable price feeds.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 import time
 
@@ -59,6 +61,26 @@ PYTH_COIN_SYMBOLS = {
     'cosmos': 'ATOM',
 }
 
+# Retries run on the Streamlit script thread, so keep their backoff short (0.3s, 0.6s, ...)
+# and capped; callers fall back to cached data rather than wait out a long outage
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_BACKOFF_MAX = 2  # seconds
+
+
+def _retry_policy() -> Retry:
+    """Build the adapter retry policy for throttling and transient gateway errors."""
+    options = dict(
+        total=settings.PYTH_API_RETRY_ATTEMPTS,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=[429, 502, 503, 504],
+        raise_on_status=False
+    )
+    try:
+        return Retry(backoff_max=RETRY_BACKOFF_MAX, **options)
+    except TypeError:
+        # urllib3 < 2 has no backoff_max; the short factor keeps waits to a few seconds anyway
+        return Retry(**options)
+
 
 class PythNetworkClient:
     """Client for interacting with Pyth Network Hermes API."""
@@ -72,6 +94,14 @@ class PythNetworkClient:
             'User-Agent': 'CryptoInsight-Pro/1.0',
             'Accept': 'application/json'
         })
+        
+        # Keep-alive connection pool with retries on throttling/transient errors
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=_retry_policy()
+        )
+        self.session.mount('https://', adapter)
         self.request_count = 0
         self.last_request_time = 0
     
@@ -110,7 +140,7 @@ class PythNetworkClient:
         url = f"{self.BASE_URL}{endpoint}"
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=settings.PYTH_API_TIMEOUT)
             response.raise_for_status()
             return response.json()
         
@@ -210,9 +240,25 @@ class PythNetworkClient:
             logger.error(f"Error fetching prices from Pyth Network: {e}")
             raise APIError(f"Failed to fetch prices: {str(e)}")
     
-    def get_historical_data(self, coin_id: str, days: int = 30) -> 'pd.DataFrame':
+    def _get_coin_price(self, coin_id: str) -> Optional[Dict]:
         """
-        Fetch historical price data for a cryptocurrency.
+        Get current price data for a single coin.
+        
+        Tracked coins are read from the batched snapshot of all tracked feeds, so
+        per-coin callers share one cached request instead of issuing one each.
+        
+        Args:
+            coin_id: Coin identifier
+            
+        Returns:
+            Price data dictionary or None if unavailable
+        """
+        coin_ids = settings.TRACKED_COINS if coin_id in settings.TRACKED_COINS else [coin_id]
+        return self.get_current_prices(coin_ids).get(coin_id)
+    
+    def get_historical_arrays(self, coin_id: str, days: int = 30) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Fetch historical price data for a cryptocurrency as raw arrays.
         
         Note: Pyth Network focuses on real-time data. For historical data,
         we'll need to either:
@@ -227,19 +273,21 @@ class PythNetworkClient:
             days: Number of days of historical data
             
         Returns:
-            DataFrame with columns: timestamp, price
+            Tuple of (timestamps as int64 epoch nanoseconds, prices as float64)
         """
-        import pandas as pd
-        import numpy as np
-        
         logger.warning(f"Pyth Network doesn't provide historical REST API. Returning simulated data for {coin_id}")
         
         # Get current price
-        current_data = self.get_current_prices([coin_id])
-        if not current_data or coin_id not in current_data:
+        coin_data = self._get_coin_price(coin_id)
+        if not coin_data:
             raise APIError(f"Could not fetch current price for {coin_id}")
         
-        current_price = current_data[coin_id]['current_price']
+        return self._simulate_history(coin_data['current_price'], days)
+    
+    def _simulate_history(self, current_price: float, days: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Generate a simulated hourly price history ending at the current price level."""
+        import pandas as pd
+        import numpy as np
         
         # Generate simulated historical data with realistic volatility
         timestamps = pd.date_range(end=datetime.now(), periods=days * 24, freq='H')
@@ -249,13 +297,70 @@ class PythNetworkClient:
         returns = np.random.normal(0, volatility, len(timestamps))
         prices = current_price * np.exp(np.cumsum(returns))
         
+        return timestamps.asi8, prices
+    
+    def get_historical_data(self, coin_id: str, days: int = 30) -> 'pd.DataFrame':
+        """
+        Fetch historical price data for a cryptocurrency.
+        
+        See get_historical_arrays for how the data is produced.
+        
+        Args:
+            coin_id: Coin identifier
+            days: Number of days of historical data
+            
+        Returns:
+            DataFrame with columns: timestamp, price
+        """
+        import pandas as pd
+        
+        timestamps_ns, prices = self.get_historical_arrays(coin_id, days=days)
+        
         df = pd.DataFrame({
-            'timestamp': timestamps,
+            'timestamp': pd.DatetimeIndex(timestamps_ns),
             'price': prices
         })
         
         return df
     
+    def get_historical_data_many(self, coin_ids: List[str], days: int = 30) -> Dict[str, 'pd.DataFrame']:
+        """
+        Fetch historical price data for several cryptocurrencies at once.
+        
+        All coins are priced from a single batched price request rather than
+        one request per coin.
+        
+        Args:
+            coin_ids: List of coin identifiers
+            days: Number of days of historical data
+            
+        Returns:
+            Dictionary mapping coin IDs to DataFrames with columns: timestamp, price
+        """
+        import pandas as pd
+        
+        logger.warning(f"Pyth Network doesn't provide historical REST API. Returning simulated data for {coin_ids}")
+        
+        # Reuse the cached snapshot of all tracked feeds when possible
+        if all(coin_id in settings.TRACKED_COINS for coin_id in coin_ids):
+            prices_data = self.get_current_prices(settings.TRACKED_COINS)
+        else:
+            prices_data = self.get_current_prices(coin_ids)
+        
+        result = {}
+        for coin_id in coin_ids:
+            coin_data = prices_data.get(coin_id)
+            if not coin_data:
+                raise APIError(f"Could not fetch current price for {coin_id}")
+            
+            timestamps_ns, prices = self._simulate_history(coin_data['current_price'], days)
+            result[coin_id] = pd.DataFrame({
+                'timestamp': pd.DatetimeIndex(timestamps_ns),
+                'price': prices
+            })
+        
+        return result
+    
     def get_trending_coins(self) -> List[Dict]:
         """
         Get trending cryptocurrencies.
@@ -291,13 +396,11 @@ class PythNetworkClient:
         Returns:
             Dictionary with coin details
         """
-        prices = self.get_current_prices([coin_id])
+        data = self._get_coin_price(coin_id)
         
-        if coin_id not in prices:
+        if not data:
             raise APIError(f"Coin {coin_id} not found")
         
-        data = prices[coin_id]
-        
         return {
             'id': coin_id,
             'symbol': data['symbol'],
@@ -5,11 +5,19 @@ All charts follow consistent dark theme styling.
 
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
 
+# Serialize figures with orjson when available (encodes NumPy arrays natively)
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
 # Dark theme configuration
 DARK_THEME = {
     'template': 'plotly_dark',
@@ -23,6 +31,70 @@ PRIMARY_COLOR = '#4F46E5'
 SUCCESS_COLOR = '#10B981'
 DANGER_COLOR = '#EF4444'
 
+# Page stylesheets, built once at import instead of on every script rerun
+APP_CSS = """
+    <style>
+    .main {
+        background-color: #0E1117;
+        color: #FAFAFA;
+    }
+    .stButton>button {
+        background-color: #4F46E5;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 0.5rem 1rem;
+    }
+    .stButton>button:hover {
+        background-color: #4338CA;
+        color: white;
+    }
+    .metric-card {
+        background-color: #1E293B;
+        padding: 1.5rem;
+        border-radius: 8px;
+        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+    }
+    </style>
+"""
+
+MARKET_OVERVIEW_CSS = """
+    <style>
+    .metric-card {
+        background-color: #1E293B;
+        padding: 1.5rem;
+        border-radius: 8px;
+        border: 1px solid #374151;
+    }
+    .positive { color: #10B981; }
+    .negative { color: #EF4444; }
+    </style>
+"""
+
+PREDICTIONS_CSS = """
+    <style>
+    .prediction-card {
+        background-color: #1E293B;
+        padding: 1.5rem;
+        border-radius: 8px;
+        border: 1px solid #374151;
+        margin: 1rem 0;
+    }
+    .metric-highlight {
+        background-color: #0F172A;
+        padding: 1rem;
+        border-radius: 6px;
+        border-left: 4px solid #3B82F6;
+    }
+    .forecast-positive { color: #10B981; font-weight: bold; }
+    .forecast-negative { color: #EF4444; font-weight: bold; }
+    .confidence-band {
+        fill: rgba(59, 130, 246, 0.1);
+        stroke: rgba(59, 130, 246, 0.3);
+    }
+    </style>
+"""
+
 
 def create_price_chart(df: pd.DataFrame, title: str) -> go.Figure:
     """Create interactive price chart."""